@@ -182,7 +182,7 @@ def main():
                             
                             with col2:
                                 if generate_charts:
-                                    chart_path = f"charts/ic_{ic['expiration']}_{ic['long_put_strike']}_{ic['short_put_strike']}_{ic['short_call_strike']}_{ic['long_call_strike']}.png"
+                                    chart_path = f"charts/ic_{ic['expiration']}_{ic['long_put_strike']}_{ic['short_put_strike']}_{ic['short_call_strike']}_{ic['long_call_strike']}.webp"
                                     show_chart(chart_path)
                                 else:
                                     st.info("P/L Charts are disabled. Enable in settings to see visualization.")
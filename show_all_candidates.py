@@ -58,11 +58,11 @@ def main():
         print("\nAll Iron Condor Candidates:")
         print("-" * 100)
         
-        # Sort by various metrics
-        by_prob = sorted(iron_condors, key=lambda x: x['probability_of_profit'], reverse=True)
-        by_delta = sorted(iron_condors, key=lambda x: abs(x['position_delta']))
-        by_credit = sorted(iron_condors, key=lambda x: x['net_credit'], reverse=True)
-        by_score = sorted(iron_condors, key=lambda x: x['strategy_score'], reverse=True)
+        # Pick the top 3 by various metrics - no need to sort every candidate
+        by_prob = Utils.sort_iron_condors(iron_condors, "probability", top_k=3)
+        by_delta = Utils.sort_iron_condors(iron_condors, "delta", top_k=3)
+        by_credit = Utils.sort_iron_condors(iron_condors, "credit", top_k=3)
+        by_score = Utils.sort_iron_condors(iron_condors, "score", top_k=3)
         
         # Print top 3 by probability
         print("\n🎯 TOP 3 BY PROBABILITY OF PROFIT:")
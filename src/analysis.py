@@ -1,10 +1,14 @@
 import math
+import numpy as np
 from scipy.stats import norm
 
+# Annual risk-free rate shared by the analysis and the data sources' Greek estimates
+RISK_FREE_RATE = 0.05
+
 class OptionsAnalysis:
     """Class for options analysis functions"""
     
-    def __init__(self, risk_free_rate=0.05):
+    def __init__(self, risk_free_rate=RISK_FREE_RATE):
         """Initialize with risk-free rate"""
         self.risk_free_rate = risk_free_rate
     
@@ -14,79 +18,88 @@ class OptionsAnalysis:
         Calculate probability of profit for an iron condor
         
         This uses the Black-Scholes model to estimate the probability that the 
-        underlying price will remain between the short strikes at expiration
+        underlying price will remain between the short strikes at expiration.
+        Strikes, days to expiration and volatility may also be arrays, in which case
+        an ndarray of probabilities is returned, computed in one vectorized pass.
         """
+        if any(np.ndim(x) for x in (short_put_strike, short_call_strike, days_to_expiration, volatility)):
+            return self._probabilities_of_profit(current_price, short_put_strike, short_call_strike,
+                                                 days_to_expiration, volatility)[0]
+        
         # Sanity check - ensure short_put_strike < current_price < short_call_strike
-        if short_put_strike >= current_price or current_price >= short_call_strike:
+        straddles = short_put_strike < current_price < short_call_strike
+        if not straddles:
             print(f"Warning: Strikes don't straddle current price - put: {short_put_strike}, price: {current_price}, call: {short_call_strike}")
-            # For strikes that don't straddle the current price, use distance-based estimate
-            put_distance = abs(current_price - short_put_strike) / current_price
-            call_distance = abs(short_call_strike - current_price) / current_price
-            
-            # Higher probability for further OTM strikes
-            if put_distance > 0.03 and call_distance > 0.03:
-                return 0.7  # Further OTM strikes have better probability
+        else:
+            normalized = float(self._normalize_volatility(volatility))
+            print(f"Using normalized volatility: {normalized:.2f} ({normalized*100:.1f}%)")
+        
+        prob, put_stdevs, call_stdevs = self._probabilities_of_profit(
+            current_price, short_put_strike, short_call_strike, days_to_expiration, volatility)
+        
+        if straddles:
+            if days_to_expiration > 0:
+                print(f"Probability calculation: put_stdevs={float(put_stdevs):.2f}, call_stdevs={float(call_stdevs):.2f}, prob={float(prob):.2f}")
             else:
-                return 0.4  # Closer strikes have lower probability
-            
-        # Normalize volatility - Schwab API often returns extremely high values
-        # First, detect if volatility is already a decimal or percentage
-        if volatility > 10:  # Likely a percentage value (like 25% not 0.25)
-            volatility = volatility / 100.0
-            
-        # Further cap volatility at reasonable levels
-        volatility = max(min(volatility, 0.50), 0.10)  # Between 10% and 50%
+                print(f"Error in probability calculation: no time to expiration ({days_to_expiration} days)")
+        return float(prob)
+    
+    @staticmethod
+    def _normalize_volatility(volatility):
+        """Bring volatility to a decimal between 10% and 50%
         
-        print(f"Using normalized volatility: {volatility:.2f} ({volatility*100:.1f}%)")
+        Schwab API often returns extremely high values, and sometimes percentages (25 not 0.25)
+        """
+        volatility = np.asarray(volatility, dtype=float)
+        volatility = np.where(volatility > 10, volatility / 100.0, volatility)
+        return np.minimum(np.maximum(volatility, 0.10), 0.50)
+    
+    def _probabilities_of_profit(self, current_price, short_put_strike, short_call_strike,
+                                 days_to_expiration, volatility):
+        """Vectorized probability of profit, returning (prob, put_stdevs, call_stdevs) arrays"""
+        short_put_strike, short_call_strike, days_to_expiration, volatility = np.broadcast_arrays(
+            *(np.asarray(x, dtype=float) for x in (short_put_strike, short_call_strike,
+                                                   days_to_expiration, volatility)))
+        volatility = self._normalize_volatility(volatility)
         
-        # Annual volatility to daily
+        # Standard deviation of price movement over the period, from annual volatility
         daily_volatility = volatility / math.sqrt(252)
+        std_dev = current_price * daily_volatility * np.sqrt(np.maximum(days_to_expiration, 0))
         
-        # Standard deviation of price movement over the period
-        std_dev = current_price * daily_volatility * math.sqrt(days_to_expiration)
-        
-        try:
-            # Use a simplified model based on standard deviations
-            # Calculate how many standard deviations away each strike is
+        # Use a simplified model based on standard deviations
+        # Calculate how many standard deviations away each strike is
+        with np.errstate(divide='ignore', invalid='ignore'):
             put_stdevs = (current_price - short_put_strike) / std_dev
             call_stdevs = (short_call_strike - current_price) / std_dev
-            
-            # Calculate probability using normal CDF
-            prob_above_put = norm.cdf(put_stdevs)
-            prob_below_call = norm.cdf(call_stdevs)
-            
-            # Combined probability - the probability of staying between both strikes
-            prob = prob_above_put * prob_below_call
-            
-            # For very short-term options or extreme volatility, use a more conservative estimate
-            if days_to_expiration <= 2 or volatility > 0.4:
-                prob = min(prob, 0.85)  # Cap at 85% for very short term or high volatility
-                
-            # Ensure reasonable bounds
-            prob = max(min(prob, 0.95), 0.05)  # Between 5% and 95%
-            
-            # Special case common iron condor probability range
-            if 0.1 < put_stdevs < 2.0 and 0.1 < call_stdevs < 2.0:
-                # Typical iron condor is set up for 70-85% probability
-                estimated_prob = 0.5 + (min(put_stdevs, call_stdevs) / 8.0)
-                # Blend with the calculated probability
-                prob = (prob + estimated_prob) / 2.0
-                
-            print(f"Probability calculation: put_stdevs={put_stdevs:.2f}, call_stdevs={call_stdevs:.2f}, prob={prob:.2f}")
-            return prob
-            
-        except (ValueError, ZeroDivisionError) as e:
-            print(f"Error in probability calculation: {e}")
-            
-            # Fallback based on strike widths
-            put_width_pct = (current_price - short_put_strike) / current_price
-            call_width_pct = (short_call_strike - current_price) / current_price
-            
-            # Width-based probability estimate (wider is better)
-            avg_width = (put_width_pct + call_width_pct) / 2
-            prob = min(0.5 + (avg_width * 10), 0.9)  # Scale with width, cap at 90%
-            
-            return prob
+        
+        # Combined probability - the probability of staying between both strikes
+        prob = norm.cdf(put_stdevs) * norm.cdf(call_stdevs)
+        
+        # For very short-term options or extreme volatility, use a more conservative estimate
+        prob = np.where((days_to_expiration <= 2) | (volatility > 0.4), np.minimum(prob, 0.85), prob)
+        
+        # Ensure reasonable bounds
+        prob = np.minimum(np.maximum(prob, 0.05), 0.95)  # Between 5% and 95%
+        
+        # Special case common iron condor probability range
+        # Typical iron condor is set up for 70-85% probability; blend with the calculated probability
+        typical = (0.1 < put_stdevs) & (put_stdevs < 2.0) & (0.1 < call_stdevs) & (call_stdevs < 2.0)
+        estimated_prob = 0.5 + (np.minimum(put_stdevs, call_stdevs) / 8.0)
+        prob = np.where(typical, (prob + estimated_prob) / 2.0, prob)
+        
+        # Fallback based on strike widths when there is no time left to model
+        put_width_pct = (current_price - short_put_strike) / current_price
+        call_width_pct = (short_call_strike - current_price) / current_price
+        avg_width = (put_width_pct + call_width_pct) / 2
+        prob = np.where(days_to_expiration > 0, prob, np.minimum(0.5 + (avg_width * 10), 0.9))
+        
+        # For strikes that don't straddle the current price, use distance-based estimate:
+        # higher probability for further OTM strikes
+        straddles = (short_put_strike < current_price) & (current_price < short_call_strike)
+        far_otm = (np.abs(put_width_pct) > 0.03) & (np.abs(call_width_pct) > 0.03)
+        prob = np.where(straddles, prob, np.where(far_otm, 0.7, 0.4))
+        
+        return prob, put_stdevs, call_stdevs
     
     def calculate_expected_profit(self, net_credit, max_loss, prob_profit):
         """Calculate expected profit based on probability of profit"""
@@ -100,6 +113,26 @@ class OptionsAnalysis:
         """
         Find iron condor option combinations that meet our criteria
         
+        See find_iron_condor_sets for the parameters.
+        
+        Returns:
+        list: List of dictionaries with iron condor details
+        """
+        return self.find_iron_condor_sets(
+            options_data, current_price, lower_bound, upper_bound, min_dte, max_dte, min_liquidity,
+            max_delta=max_delta, keep_best_candidates=keep_best_candidates, spread_width=spread_width
+        )[0]
+    
+    def find_iron_condor_sets(self, options_data, current_price, lower_bound, upper_bound, 
+                              min_dte, max_dte, min_liquidity, max_delta=0.03, relaxed_max_delta=None,
+                              keep_best_candidates=True, spread_width=25):
+        """
+        Find iron condors for a strict and a relaxed delta limit in a single scan
+        
+        Each set is exactly what a separate find_iron_condors run at that limit would return,
+        including the per-expiration best candidate, which is searched for whenever that set
+        has nothing for the expiration.
+        
         Parameters:
         options_data (dict): Options chain data
         current_price (float): Current price of the underlying
@@ -109,12 +142,16 @@ class OptionsAnalysis:
         max_dte (int): Maximum days to expiration
         min_liquidity (int): Minimum volume/open interest
         max_delta (float): Maximum acceptable overall position delta
+        relaxed_max_delta (float): Looser delta limit for the second set (default: max_delta)
         keep_best_candidates (bool): Keep best candidates even if they don't meet all criteria
         spread_width (int): Width between short and long legs (default: 25 points)
         
         Returns:
-        list: List of dictionaries with iron condor details
+        tuple: (strict, relaxed) lists of dictionaries with iron condor details - the same
+        list twice when relaxed_max_delta is not above max_delta
         """
+        relaxed_max_delta = max(max_delta, relaxed_max_delta or max_delta)
+        
         print(f"Finding iron condors with these parameters:")
         print(f"- Current price: ${current_price}")
         print(f"- Expected range: ${lower_bound} to ${upper_bound}")
@@ -130,6 +167,7 @@ class OptionsAnalysis:
         print(f"Target short call strike: ${target_short_call:.2f} (2% above current)")
         
         iron_condors = []
+        relaxed_condors = [] if relaxed_max_delta > max_delta else iron_condors
         rejected_count = {
             'liquidity': 0,
             'credit': 0,
@@ -164,9 +202,9 @@ class OptionsAnalysis:
             put_options = []
             
             # Process call options for this expiration
-            for strike in options_data['callExpDateMap'].get(expiration, {}):
+            for strike, options in options_data['callExpDateMap'].get(expiration, {}).items():
                 try:
-                    option = options_data['callExpDateMap'][expiration][strike][0]
+                    option = options[0]
                     
                     # Filter by basic liquidity - relaxed check to include more options
                     if option.get('totalVolume', 0) < min_liquidity / 2:  # Allow half the normal minimum 
@@ -190,9 +228,9 @@ class OptionsAnalysis:
                     continue
             
             # Process put options for this expiration
-            for strike in options_data['putExpDateMap'].get(expiration, {}):
+            for strike, options in options_data['putExpDateMap'].get(expiration, {}).items():
                 try:
-                    option = options_data['putExpDateMap'][expiration][strike][0]
+                    option = options[0]
                     
                     # Filter by basic liquidity - relaxed check to include more options
                     if option.get('totalVolume', 0) < min_liquidity / 2:  # Allow half the normal minimum
@@ -380,10 +418,11 @@ class OptionsAnalysis:
                         prob_profit=prob_profit
                     )
                     
-                    # Filter by delta neutrality
+                    # Filter by delta neutrality - condors between the limits only join the relaxed set
                     if abs(position_delta) > max_delta:
                         rejected_count['delta'] += 1
-                        continue
+                        if abs(position_delta) > relaxed_max_delta:
+                            continue
                     
                     # Calculate distances from current price as percentages
                     put_distance_pct = ((current_price - short_put['strike']) / current_price) * 100
@@ -432,8 +471,8 @@ class OptionsAnalysis:
                     # Combine the scores - emphasize position score
                     strategy_score = position_score * 4 + prob_score + credit_score
                     
-                    # Add to our list of potential iron condors
-                    iron_condors.append({
+                    # Add to our lists of potential iron condors
+                    condor = {
                         'expiration': exp_date,
                         'dte': dte,
                         'long_put_strike': long_put['strike'],
@@ -456,14 +495,25 @@ class OptionsAnalysis:
                         'strategy_score': strategy_score,  # New field for scoring
                         'put_distance_pct': put_distance_pct,  # Store distances for reference
                         'call_distance_pct': call_distance_pct
-                    })
+                    }
+                    if abs(position_delta) <= max_delta:
+                        iron_condors.append(condor)
+                    if relaxed_condors is not iron_condors:
+                        relaxed_condors.append(condor)
                     print(f"ADDED IRON CONDOR: {short_put['strike']}/{short_call['strike']} | Score: {strategy_score:.2f}")
             
             if ic_candidates > 0:
                 print(f"Found {ic_candidates} potential iron condors for {exp_date}")
                 
+                # Result sets with nothing for this expiration yet, with their delta limits
+                condor_sets = [(max_delta, iron_condors)]
+                if relaxed_condors is not iron_condors:
+                    condor_sets.append((relaxed_max_delta, relaxed_condors))
+                missing_sets = [(limit, condors) for limit, condors in condor_sets
+                                if not any(ic['expiration'] == exp_date for ic in condors)]
+                
                 # If we want to keep the best candidate for this expiration regardless of criteria
-                if keep_best_candidates and not any(ic['expiration'] == exp_date for ic in iron_condors):
+                if keep_best_candidates and missing_sets:
                     # Only consider expirations within our DTE range
                     if dte < min_dte or dte > max_dte:
                         print(f"Skipping best candidate search for {exp_date} (DTE: {dte}) - outside DTE range {min_dte}-{max_dte}")
@@ -523,129 +573,130 @@ class OptionsAnalysis:
                                     'call_distance_pct': call_distance_pct
                                 })
                     
-                    # If we found any candidates, add the best one
+                    # If we found any candidates, add the best one to each set missing this expiration
                     if exp_candidates:
-                        # First filter candidates by delta
-                        delta_filtered_candidates = []
-                        for candidate in exp_candidates:
-                            short_put = candidate['short_put']
-                            long_put = candidate['long_put']
-                            short_call = candidate['short_call']
-                            long_call = candidate['long_call']
+                        for set_max_delta, condors in missing_sets:
+                            # First filter candidates by delta
+                            delta_filtered_candidates = []
+                            for candidate in exp_candidates:
+                                short_put = candidate['short_put']
+                                long_put = candidate['long_put']
+                                short_call = candidate['short_call']
+                                long_call = candidate['long_call']
+                                
+                                # Calculate position delta
+                                position_delta = (long_put.get('delta', 0) + short_put.get('delta', 0) + 
+                                               short_call.get('delta', 0) + long_call.get('delta', 0))
+                                
+                                # Check delta neutrality - IMPORTANT: Use absolute value
+                                if abs(position_delta) <= set_max_delta:
+                                    candidate['position_delta'] = position_delta
+                                    delta_filtered_candidates.append(candidate)
                             
-                            # Calculate position delta
-                            position_delta = (long_put.get('delta', 0) + short_put.get('delta', 0) + 
-                                           short_call.get('delta', 0) + long_call.get('delta', 0))
+                            # If no candidates meet delta constraint, don't add any
+                            if not delta_filtered_candidates:
+                                print(f"No delta-neutral candidates found for {exp_date} (max_delta: {set_max_delta})")
+                                continue
+                                
+                            # Sort delta-filtered candidates by distance score
+                            delta_filtered_candidates.sort(key=lambda x: x['distance_score'], reverse=True)
+                            best = delta_filtered_candidates[0]
                             
-                            # Check delta neutrality - IMPORTANT: Use absolute value
-                            if abs(position_delta) <= max_delta:
-                                candidate['position_delta'] = position_delta
-                                delta_filtered_candidates.append(candidate)
-                        
-                        # If no candidates meet delta constraint, don't add any
-                        if not delta_filtered_candidates:
-                            print(f"No delta-neutral candidates found for {exp_date} (max_delta: {max_delta})")
-                            continue
+                            # Use this delta-filtered candidate
+                            short_put = best['short_put']
+                            long_put = best['long_put']
+                            short_call = best['short_call']
+                            long_call = best['long_call']
+                            position_delta = best['position_delta']
                             
-                        # Sort delta-filtered candidates by distance score
-                        delta_filtered_candidates.sort(key=lambda x: x['distance_score'], reverse=True)
-                        best = delta_filtered_candidates[0]
-                        
-                        # Use this delta-filtered candidate
-                        short_put = best['short_put']
-                        long_put = best['long_put']
-                        short_call = best['short_call']
-                        long_call = best['long_call']
-                        position_delta = best['position_delta']
-                        
-                        # Now add this as a full iron condor
-                        net_credit = best['net_credit']
-                        put_width = short_put['strike'] - long_put['strike']
-                        call_width = long_call['strike'] - short_call['strike']
-                        max_loss = max(put_width, call_width) * 100 - (net_credit * 100)
-                        
-                        # Normalize volatility from Schwab API
-                        leg_vols = []
-                        for leg in [long_put, short_put, short_call, long_call]:
-                            vol = leg.get('volatility', 20)
-                            if vol > 10:
-                                vol = vol / 100.0
-                            vol = max(min(vol, 0.5), 0.1)
-                            leg_vols.append(vol)
-                        
-                        avg_vol = sum(leg_vols) / len(leg_vols)
-                        
-                        # Calculate probability
-                        prob_profit = self.calculate_probability_of_profit(
-                            current_price=current_price,
-                            short_put_strike=short_put['strike'],
-                            short_call_strike=short_call['strike'],
-                            days_to_expiration=dte,
-                            volatility=avg_vol
-                        )
-                        
-                        # Calculate Greeks
-                        position_gamma = (long_put.get('gamma', 0.01) + short_put.get('gamma', 0.01) + 
-                                        short_call.get('gamma', 0.01) + long_call.get('gamma', 0.01))
-                        position_theta = (long_put.get('theta', -0.01) + short_put.get('theta', -0.01) + 
-                                        short_call.get('theta', -0.01) + long_call.get('theta', -0.01))
-                        position_vega = (long_put.get('vega', 0.1) + short_put.get('vega', 0.1) + 
-                                        short_call.get('vega', 0.1) + long_call.get('vega', 0.1))
-                        
-                        # Expected profit
-                        expected_profit = self.calculate_expected_profit(
-                            net_credit=net_credit,
-                            max_loss=max_loss,
-                            prob_profit=prob_profit
-                        )
-                        
-                        # Strategy score
-                        target_put_distance = put_pct_move  # Desired percent distance (typically 2%)
-                        target_call_distance = call_pct_move  # Desired percent distance (typically 2%)
-                        
-                        # Use same scoring function as above
-                        def distance_score(actual, target):
-                            diff = abs(actual - target)
-                            if diff <= 0.5:  # Within our wider range of +/- 0.5%
-                                return 15 - diff * 10  # Gradual reduction within range
-                            else:
-                                return 15 - 5 - (diff - 0.5) * 15  # Steeper penalty outside range
-                                
-                        put_distance_score = distance_score(best['put_distance_pct'], target_put_distance)
-                        call_distance_score = distance_score(best['call_distance_pct'], target_call_distance)
-                        position_score = max(0, put_distance_score) + max(0, call_distance_score)
-                        prob_score = prob_profit * 5
-                        credit_per_risk = net_credit / (max_loss / 100) if max_loss > 0 else 0
-                        credit_score = credit_per_risk * 10
-                        strategy_score = position_score * 4 + prob_score + credit_score
-                        
-                        # Add to our list
-                        iron_condors.append({
-                            'expiration': exp_date,
-                            'dte': dte,
-                            'long_put_strike': long_put['strike'],
-                            'short_put_strike': short_put['strike'],
-                            'short_call_strike': short_call['strike'],
-                            'long_call_strike': long_call['strike'],
-                            'net_credit': net_credit,
-                            'max_loss': max_loss,
-                            'position_delta': position_delta,
-                            'position_gamma': position_gamma,
-                            'position_theta': position_theta,
-                            'position_vega': position_vega,
-                            'avg_spread_pct': 0.1,  # Placeholder
-                            'risk_reward': max_loss / (net_credit * 100) if net_credit > 0 else float('inf'),
-                            'put_width': put_width,
-                            'call_width': call_width,
-                            'expected_profit': expected_profit,
-                            'probability_of_profit': prob_profit * 100,
-                            'implied_volatility': avg_vol,
-                            'strategy_score': strategy_score,
-                            'put_distance_pct': best['put_distance_pct'],
-                            'call_distance_pct': best['call_distance_pct'],
-                            'is_best_candidate': True  # Mark this as a "best candidate" that might not meet all criteria
-                        })
-                        print(f"ADDED BEST CANDIDATE: {short_put['strike']}/{short_call['strike']} | Score: {strategy_score:.2f}")
+                            # Now add this as a full iron condor
+                            net_credit = best['net_credit']
+                            put_width = short_put['strike'] - long_put['strike']
+                            call_width = long_call['strike'] - short_call['strike']
+                            max_loss = max(put_width, call_width) * 100 - (net_credit * 100)
+                            
+                            # Normalize volatility from Schwab API
+                            leg_vols = []
+                            for leg in [long_put, short_put, short_call, long_call]:
+                                vol = leg.get('volatility', 20)
+                                if vol > 10:
+                                    vol = vol / 100.0
+                                vol = max(min(vol, 0.5), 0.1)
+                                leg_vols.append(vol)
+                            
+                            avg_vol = sum(leg_vols) / len(leg_vols)
+                            
+                            # Calculate probability
+                            prob_profit = self.calculate_probability_of_profit(
+                                current_price=current_price,
+                                short_put_strike=short_put['strike'],
+                                short_call_strike=short_call['strike'],
+                                days_to_expiration=dte,
+                                volatility=avg_vol
+                            )
+                            
+                            # Calculate Greeks
+                            position_gamma = (long_put.get('gamma', 0.01) + short_put.get('gamma', 0.01) + 
+                                            short_call.get('gamma', 0.01) + long_call.get('gamma', 0.01))
+                            position_theta = (long_put.get('theta', -0.01) + short_put.get('theta', -0.01) + 
+                                            short_call.get('theta', -0.01) + long_call.get('theta', -0.01))
+                            position_vega = (long_put.get('vega', 0.1) + short_put.get('vega', 0.1) + 
+                                            short_call.get('vega', 0.1) + long_call.get('vega', 0.1))
+                            
+                            # Expected profit
+                            expected_profit = self.calculate_expected_profit(
+                                net_credit=net_credit,
+                                max_loss=max_loss,
+                                prob_profit=prob_profit
+                            )
+                            
+                            # Strategy score
+                            target_put_distance = put_pct_move  # Desired percent distance (typically 2%)
+                            target_call_distance = call_pct_move  # Desired percent distance (typically 2%)
+                            
+                            # Use same scoring function as above
+                            def distance_score(actual, target):
+                                diff = abs(actual - target)
+                                if diff <= 0.5:  # Within our wider range of +/- 0.5%
+                                    return 15 - diff * 10  # Gradual reduction within range
+                                else:
+                                    return 15 - 5 - (diff - 0.5) * 15  # Steeper penalty outside range
+                                    
+                            put_distance_score = distance_score(best['put_distance_pct'], target_put_distance)
+                            call_distance_score = distance_score(best['call_distance_pct'], target_call_distance)
+                            position_score = max(0, put_distance_score) + max(0, call_distance_score)
+                            prob_score = prob_profit * 5
+                            credit_per_risk = net_credit / (max_loss / 100) if max_loss > 0 else 0
+                            credit_score = credit_per_risk * 10
+                            strategy_score = position_score * 4 + prob_score + credit_score
+                            
+                            # Add to our list
+                            condors.append({
+                                'expiration': exp_date,
+                                'dte': dte,
+                                'long_put_strike': long_put['strike'],
+                                'short_put_strike': short_put['strike'],
+                                'short_call_strike': short_call['strike'],
+                                'long_call_strike': long_call['strike'],
+                                'net_credit': net_credit,
+                                'max_loss': max_loss,
+                                'position_delta': position_delta,
+                                'position_gamma': position_gamma,
+                                'position_theta': position_theta,
+                                'position_vega': position_vega,
+                                'avg_spread_pct': 0.1,  # Placeholder
+                                'risk_reward': max_loss / (net_credit * 100) if net_credit > 0 else float('inf'),
+                                'put_width': put_width,
+                                'call_width': call_width,
+                                'expected_profit': expected_profit,
+                                'probability_of_profit': prob_profit * 100,
+                                'implied_volatility': avg_vol,
+                                'strategy_score': strategy_score,
+                                'put_distance_pct': best['put_distance_pct'],
+                                'call_distance_pct': best['call_distance_pct'],
+                                'is_best_candidate': True  # Mark this as a "best candidate" that might not meet all criteria
+                            })
+                            print(f"ADDED BEST CANDIDATE: {short_put['strike']}/{short_call['strike']} | Score: {strategy_score:.2f}")
         
         # Print rejection statistics
         print(f"\nRejection statistics:")
@@ -669,10 +720,11 @@ class OptionsAnalysis:
             print("  No candidates found at all")
         
         # Sort by strategy score (higher is better)
+        iron_condors.sort(key=lambda x: x['strategy_score'], reverse=True)
+        if relaxed_condors is not iron_condors:
+            relaxed_condors.sort(key=lambda x: x['strategy_score'], reverse=True)
         if iron_condors:
-            iron_condors.sort(key=lambda x: x['strategy_score'], reverse=True)
             print(f"Found {len(iron_condors)} iron condors, sorted by strategy score")
-            return iron_condors
         else:
             print("No suitable iron condors found matching your criteria.")
-            return [] 
\ No newline at end of file
+        return iron_condors, relaxed_condors 
\ No newline at end of file
@@ -2,11 +2,36 @@
 
 import requests
 import os
+import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson is optional - it parses large API response bodies several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_loads(content):
+    """Parse a JSON response body (bytes), using orjson when available"""
+    return orjson.loads(content) if orjson else json.loads(content)
+
+
+def _create_http_session():
+    """Create a pooled HTTPS session; retries are left to the callers' own logic"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=Retry(total=0))
+    session.mount('https://', adapter)
+    return session
 
 
 class DataSourceBase:
     """Base class for options data sources"""
     
+    # Shared by all data sources so repeated requests reuse open connections
+    _session = _create_http_session()
+    
     def __init__(self, symbol, min_dte, max_dte, min_liquidity):
         """Initialize the data source"""
         self.symbol = symbol
@@ -26,14 +51,14 @@ class DataSourceBase:
                         import time
                         time.sleep(2 * attempt)  # Exponential backoff: 0, 2, 4 seconds
                         
-                    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{self.symbol}?interval=1d"
+                    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{self.symbol}?interval=1d&range=1d"
                     headers = {
                         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
                     }
-                    response = requests.get(url, headers=headers)
+                    response = self._session.get(url, headers=headers)
                     
                     if response.status_code == 200:
-                        data = response.json()
+                        data = _json_loads(response.content)
                         price = data['chart']['result'][0]['meta']['regularMarketPrice']
                         self.current_price = price
                         return price
@@ -52,10 +77,10 @@ class DataSourceBase:
                 # Note: You might need an API key from https://www.alphavantage.co/
                 alpha_key = os.getenv('ALPHA_VANTAGE_KEY', 'demo')
                 url = f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol={self.symbol}&apikey={alpha_key}"
-                response = requests.get(url)
+                response = self._session.get(url)
                 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = _json_loads(response.content)
                     if 'Global Quote' in data and '05. price' in data['Global Quote']:
                         price = float(data['Global Quote']['05. price'])
                         self.current_price = price
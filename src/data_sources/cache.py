@@ -0,0 +1,71 @@
+"""On-disk cache for parsed option chain data"""
+
+import os
+import time
+import pickle
+import hashlib
+import datetime
+import functools
+from zoneinfo import ZoneInfo
+
+CACHE_DIR = os.getenv('ICC_CACHE_DIR', os.path.join('.cache', 'chains'))
+INTRADAY_TTL = 60  # Seconds while the market is open
+CLOSED_TTL = 24 * 60 * 60  # Seconds outside regular trading hours
+
+_MARKET_TZ = ZoneInfo('America/New_York')
+
+
+def chain_cache_ttl(now=None):
+    """Return how long a cached chain stays fresh: short intraday, long after the close"""
+    now = now or datetime.datetime.now(_MARKET_TZ)
+    is_open = now.weekday() < 5 and datetime.time(9, 30) <= now.time() < datetime.time(16, 0)
+    return INTRADAY_TTL if is_open else CLOSED_TTL
+
+
+def _cache_path(data_source):
+    """Build the cache file path for a data source's current query"""
+    today = datetime.datetime.now().date()
+    from_date = today + datetime.timedelta(days=data_source.min_dte)
+    to_date = today + datetime.timedelta(days=data_source.max_dte)
+    key = (f"{data_source.__class__.__name__}:{data_source.symbol}:{from_date}:{to_date}:"
+           f"{data_source.min_dte}:{data_source.max_dte}")
+    return os.path.join(CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + '.pkl')
+
+
+def cached_chain(method):
+    """Cache the transformed result of a get_option_chain() method on disk
+
+    The parsed dict is stored rather than the raw response, so a hit skips both
+    the network request and the conversion. Pass force_refresh=True to bypass it.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, force_refresh=False, **kwargs):
+        path = _cache_path(self)
+
+        if not force_refresh:
+            try:
+                if time.time() - os.path.getmtime(path) < chain_cache_ttl():
+                    with open(path, 'rb') as f:
+                        result = pickle.load(f)
+                    print("Using cached options chain data")
+                    if not self.current_price:
+                        self.current_price = result.get('underlying')
+                    return result
+            except (OSError, EOFError, pickle.UnpicklingError):
+                pass  # Missing or unreadable entry - fetch fresh data
+
+        result = method(self, *args, **kwargs)
+
+        if result:
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                print(f"Could not write options chain cache: {e}")
+
+        return result
+
+    return wrapper
@@ -2,14 +2,17 @@
 
 import os
 import datetime  # Required for datetime operations
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
-from .base import DataSourceBase
+from .base import DataSourceBase, _json_loads
 
 # Load environment variables
 load_dotenv()
 
+# Maximum number of CBOE requests in flight at once
+MAX_FETCH_WORKERS = 8
+
 
 class CBOEDataSource(DataSourceBase):
     """CBOE Options data source for options chains"""
@@ -57,67 +60,49 @@ class CBOEDataSource(DataSourceBase):
             'Content-Type': 'application/json'
         }
         
-        # For each expiration, get call and put data
-        for exp_date in valid_expirations:
-            exp_key = f"{exp_date}:"
-            options_data['callExpDateMap'][exp_key] = {}
-            options_data['putExpDateMap'][exp_key] = {}
-            
-            try:
-                # Fetch calls
-                call_params = {
-                    'symbol': self.symbol,
-                    'optionType': 'C',
-                    'expirationDate': exp_date,
-                }
-                
-                call_response = requests.get(url, headers=headers, params=call_params)
-                if call_response.status_code == 200:
-                    calls = call_response.json()
-                    for call in calls:
-                        if lower_bound <= call['strike'] <= upper_bound:
-                            strike_key = str(call['strike'])
-                            option_data = [{
-                                'bid': call.get('bid', 0),
-                                'ask': call.get('ask', 0),
-                                'delta': call.get('delta', 0.5),
-                                'gamma': call.get('gamma', 0.01),
-                                'theta': call.get('theta', -0.01),
-                                'vega': call.get('vega', 0.1),
-                                'totalVolume': call.get('volume', 0),
-                                'openInterest': call.get('openInterest', 0),
-                                'volatility': call.get('impliedVolatility', 0.2)
-                            }]
-                            options_data['callExpDateMap'][exp_key][strike_key] = option_data
-                
-                # Fetch puts
-                put_params = {
-                    'symbol': self.symbol,
-                    'optionType': 'P',
-                    'expirationDate': exp_date,
-                }
-                
-                put_response = requests.get(url, headers=headers, params=put_params)
-                if put_response.status_code == 200:
-                    puts = put_response.json()
-                    for put in puts:
-                        if lower_bound <= put['strike'] <= upper_bound:
-                            strike_key = str(put['strike'])
-                            option_data = [{
-                                'bid': put.get('bid', 0),
-                                'ask': put.get('ask', 0),
-                                'delta': -put.get('delta', 0.5),  # Negative for puts
-                                'gamma': put.get('gamma', 0.01),
-                                'theta': put.get('theta', -0.01),
-                                'vega': put.get('vega', 0.1),
-                                'totalVolume': put.get('volume', 0),
-                                'openInterest': put.get('openInterest', 0),
-                                'volatility': put.get('impliedVolatility', 0.2)
-                            }]
-                            options_data['putExpDateMap'][exp_key][strike_key] = option_data
+        # Each (expiration, side) is its own request - issue them concurrently over the pooled session
+        requests_to_make = [(exp_date, option_type) for exp_date in valid_expirations for option_type in ('C', 'P')]
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(requests_to_make) or 1)) as executor:
+            results = executor.map(
+                lambda item: self._fetch_side(url, headers, *item, lower_bound, upper_bound),
+                requests_to_make
+            )
             
-            except Exception as e:
-                print(f"Error fetching CBOE data for {exp_date}: {e}")
-                # Continue with next expiration
+            for (exp_date, option_type), strikes in zip(requests_to_make, results):
+                map_name = 'callExpDateMap' if option_type == 'C' else 'putExpDateMap'
+                options_data[map_name][f"{exp_date}:"] = strikes
+        
+        return options_data
+    
+    def _fetch_side(self, url, headers, exp_date, option_type, lower_bound, upper_bound):
+        """Fetch calls ('C') or puts ('P') for one expiration as a {strike: [option]} map"""
+        params = {
+            'symbol': self.symbol,
+            'optionType': option_type,
+            'expirationDate': exp_date,
+        }
+        # CBOE reports positive deltas for puts as well
+        delta_sign = 1 if option_type == 'C' else -1
+        
+        strikes = {}
+        try:
+            response = self._session.get(url, headers=headers, params=params)
+            if response.status_code == 200:
+                for option in _json_loads(response.content):
+                    if lower_bound <= option['strike'] <= upper_bound:
+                        strikes[str(option['strike'])] = [{
+                            'bid': option.get('bid', 0),
+                            'ask': option.get('ask', 0),
+                            'delta': delta_sign * option.get('delta', 0.5),
+                            'gamma': option.get('gamma', 0.01),
+                            'theta': option.get('theta', -0.01),
+                            'vega': option.get('vega', 0.1),
+                            'totalVolume': option.get('volume', 0),
+                            'openInterest': option.get('openInterest', 0),
+                            'volatility': option.get('impliedVolatility', 0.2)
+                        }]
+        except Exception as e:
+            print(f"Error fetching CBOE data for {exp_date}: {e}")
+            # Continue with next expiration
         
-        return options_data 
\ No newline at end of file
+        return strikes
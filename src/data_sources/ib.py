@@ -1,6 +1,9 @@
 """Interactive Brokers API data source for options chains"""
 
 import os
+import time
+import atexit
+import bisect
 import datetime
 from dotenv import load_dotenv
 
@@ -15,6 +18,30 @@ from .base import DataSourceBase
 # Load environment variables
 load_dotenv()
 
+# Connections shared across IBDataSource instances, keyed by (host, port, base client ID).
+# Pooled connections stay open between calls and are closed once, at interpreter exit.
+_IB_POOL = {}
+_CONNECT_ATTEMPTS = 5
+
+
+def close_ib_connections():
+    """Disconnect every pooled Interactive Brokers connection"""
+    while _IB_POOL:
+        _, ib = _IB_POOL.popitem()
+        try:
+            if ib.isConnected():
+                ib.disconnect()
+        except Exception as e:
+            print(f"Error disconnecting from Interactive Brokers: {e}")
+
+
+atexit.register(close_ib_connections)
+
+
+def _has_quote(ticker):
+    """True once a ticker carries a usable bid, last or close - unset ib_async fields are nan"""
+    return any(x is not None and x == x and x > 0 for x in (ticker.bid, ticker.last, ticker.close))
+
 
 class IBDataSource(DataSourceBase):
     """Interactive Brokers API data source for options chains"""
@@ -30,20 +57,37 @@ class IBDataSource(DataSourceBase):
         self._cache_expiry = 300  # Cache expiry in seconds (5 minutes)
     
     def _init_client(self):
-        """Initialize the Interactive Brokers client"""
+        """Initialize the Interactive Brokers client, reusing a pooled connection if available"""
         if self.ib and self.ib.isConnected():
             return self.ib
-            
-        try:
-            ib = IB()
-            ib.connect(self.host, self.port, clientId=self.client_id)
-            # Set timeout to 30 seconds for all requests
-            ib.reqTimeout = 30
-            print(f"Connected to Interactive Brokers at {self.host}:{self.port}")
+        
+        pool_key = (self.host, self.port, self.client_id)
+        ib = _IB_POOL.get(pool_key)
+        if ib and ib.isConnected():
             return ib
-        except Exception as e:
-            print(f"Error connecting to Interactive Brokers: {e}")
-            return None
+        
+        # Retry refused or timed-out connects with exponential backoff, moving to the next
+        # client ID on each attempt in case another process on the same gateway holds this one.
+        # Any other error fails fast.
+        ib = IB()
+        for attempt in range(_CONNECT_ATTEMPTS):
+            client_id = self.client_id + attempt
+            try:
+                ib.connect(self.host, self.port, clientId=client_id, timeout=5)
+                # Set timeout to 30 seconds for all requests
+                ib.reqTimeout = 30
+                print(f"Connected to Interactive Brokers at {self.host}:{self.port} (client ID {client_id})")
+                _IB_POOL[pool_key] = ib
+                return ib
+            except (ConnectionRefusedError, TimeoutError) as e:
+                print(f"Error connecting to Interactive Brokers (attempt {attempt+1}/{_CONNECT_ATTEMPTS}): {e}")
+                if attempt < _CONNECT_ATTEMPTS - 1:
+                    time.sleep(2 ** attempt)  # Exponential backoff: 1, 2, 4, 8 seconds
+            except Exception as e:
+                print(f"Error connecting to Interactive Brokers: {e}")
+                return None
+        
+        return None
     
     def get_current_price(self):
         """Get current price from IB API"""
@@ -98,6 +142,68 @@ class IBDataSource(DataSourceBase):
             # Don't disconnect yet as we'll need the client for options chain
             pass
     
+    def _select_market_data_type(self, contract):
+        """Request live market data, falling back to delayed if the probe gets no quote"""
+        self.ib.reqMarketDataType(1)  # 1 = Live
+        probe_ticker = self.ib.reqMktData(contract)
+        
+        # Wait briefly for a quote on the underlying
+        timeout = 0
+        while timeout < 5 and not _has_quote(probe_ticker):
+            self.ib.sleep(0.5)
+            timeout += 0.5
+        
+        self.ib.cancelMktData(contract)
+        
+        if _has_quote(probe_ticker):
+            return 1
+        
+        print("Live market data not available from IB, using delayed data")
+        self.ib.reqMarketDataType(3)  # 3 = Delayed
+        return 3
+    
+    def _build_option_record(self, ticker, strike, right, exp_date, exp_str, dte, exchange):
+        """Build a Schwab-style option record from an IB ticker"""
+        is_call = right == 'C'
+        
+        # Calculate mid price if bid/ask available
+        mid_price = None
+        if ticker.bid is not None and ticker.ask is not None:
+            mid_price = (ticker.bid + ticker.ask) / 2
+        
+        greeks = ticker.modelGreeks
+        
+        return {
+            'putCall': 'CALL' if is_call else 'PUT',
+            'symbol': self.symbol,
+            'description': f"{self.symbol} {exp_date} {strike} {'Call' if is_call else 'Put'}",
+            'exchangeName': exchange,
+            'bid': ticker.bid if ticker.bid is not None else 0,
+            'ask': ticker.ask if ticker.ask is not None else 0,
+            'last': ticker.last if ticker.last is not None else 0,
+            'mark': mid_price if mid_price is not None else 0,
+            'bidSize': ticker.bidSize if ticker.bidSize is not None else 0,
+            'askSize': ticker.askSize if ticker.askSize is not None else 0,
+            'lastSize': ticker.lastSize if ticker.lastSize is not None else 0,
+            'highPrice': ticker.high if ticker.high is not None else 0,
+            'lowPrice': ticker.low if ticker.low is not None else 0,
+            'openPrice': ticker.open if ticker.open is not None else 0,
+            'closePrice': ticker.close if ticker.close is not None else 0,
+            'totalVolume': ticker.volume if ticker.volume is not None else 0,
+            'openInterest': 0,  # IB doesn't provide this directly in tickers
+            'volatility': ticker.impliedVol if ticker.impliedVol is not None else 0.2,
+            'delta': greeks.delta if greeks else 0,
+            'gamma': greeks.gamma if greeks else 0,
+            'theta': greeks.theta if greeks else 0,
+            'vega': greeks.vega if greeks else 0,
+            'rho': greeks.rho if greeks else 0,
+            'strikePrice': strike,
+            'expirationDate': exp_str,
+            'daysToExpiration': dte,
+            'multiplier': 100,
+            'inTheMoney': strike < self.current_price if is_call else strike > self.current_price
+        }
+    
     def get_option_chain(self):
         """Get options chain from Interactive Brokers API"""
         # Check if we have a valid cached version
@@ -109,8 +215,8 @@ class IBDataSource(DataSourceBase):
             print("Using cached options chain data")
             return self._option_chains_cache[cache_key]
         
-        if not self.ib:
-            self.ib = self._init_client()
+        # Reuses the live pooled connection, reconnecting only if it has dropped
+        self.ib = self._init_client()
             
         if not self.ib:
             raise ValueError("Interactive Brokers client not initialized. Please check your connection settings.")
@@ -158,199 +264,113 @@ class IBDataSource(DataSourceBase):
                 'underlying': self.current_price
             }
             
-            # Set market data type (try to use real-time data first, then fall back to delayed)
-            for market_data_type in [1, 3]:  # 1 = Live, 3 = Delayed
-                self.ib.reqMarketDataType(market_data_type)
+            # Sort each chain's strikes so the price window can be sliced by binary search
+            chain_strikes = [sorted(params.strikes) for params in chains]
+            
+            # Pick live or delayed market data once, using the underlying as a probe
+            self._select_market_data_type(contract)
+            
+            # Process each expiration
+            for params, strikes in zip(chains, chain_strikes):
+                exchange = params.exchange
                 
-                # Process each expiration
-                for params in chains:
-                    exchange = params.exchange
-                    
-                    for expiry in params.expirations:
-                        # Convert to datetime
+                for expiry in params.expirations:
+                    # Convert to datetime
+                    try:
+                        exp_date = datetime.datetime.strptime(expiry, '%Y%m%d').date()
+                    except ValueError:
                         try:
-                            exp_date = datetime.datetime.strptime(expiry, '%Y%m%d').date()
+                            exp_date = datetime.datetime.strptime(expiry, '%Y%m%d%H%M%S').date()
                         except ValueError:
-                            try:
-                                exp_date = datetime.datetime.strptime(expiry, '%Y%m%d%H%M%S').date()
-                            except ValueError:
-                                print(f"Could not parse expiration date: {expiry}")
-                                continue
-                        
-                        # Skip if outside our date range
-                        if exp_date < min_date or exp_date > max_date:
+                            print(f"Could not parse expiration date: {expiry}")
                             continue
+                    
+                    # Skip if outside our date range
+                    if exp_date < min_date or exp_date > max_date:
+                        continue
+                    
+                    # Calculate DTE (days to expiration)
+                    dte = (exp_date - today).days
+                    
+                    # Format expiration for our data structure
+                    exp_str = exp_date.strftime('%Y-%m-%d')
+                    exp_key = f"{exp_str}:{dte}"
+                    
+                    # Initialize structures for this expiration
+                    if exp_key not in result['callExpDateMap']:
+                        result['callExpDateMap'][exp_key] = {}
+                    if exp_key not in result['putExpDateMap']:
+                        result['putExpDateMap'][exp_key] = {}
+                    
+                    # Get strikes for this expiration
+                    # Filter strikes based on current price (within a reasonable range)
+                    price_buffer = 0.15  # Consider strikes within 15% of current price
+                    lo = self.current_price * (1 - price_buffer)
+                    hi = self.current_price * (1 + price_buffer)
+                    filtered_strikes = strikes[bisect.bisect_left(strikes, lo):bisect.bisect_right(strikes, hi)]
+                    
+                    # Create all option contracts at once for this expiration
+                    call_contracts = []
+                    put_contracts = []
+                    
+                    for strike in filtered_strikes:
+                        call_contract = Option(
+                            symbol=self.symbol,
+                            lastTradeDateOrContractMonth=expiry,
+                            strike=strike,
+                            right='C',
+                            exchange=exchange
+                        )
                         
-                        # Calculate DTE (days to expiration)
-                        dte = (exp_date - today).days
-                        
-                        # Format expiration for our data structure
-                        exp_str = exp_date.strftime('%Y-%m-%d')
-                        exp_key = f"{exp_str}:{dte}"
-                        
-                        # Initialize structures for this expiration
-                        if exp_key not in result['callExpDateMap']:
-                            result['callExpDateMap'][exp_key] = {}
-                        if exp_key not in result['putExpDateMap']:
-                            result['putExpDateMap'][exp_key] = {}
-                        
-                        # Get strikes for this expiration
-                        # Filter strikes based on current price (within a reasonable range)
-                        filtered_strikes = []
-                        price_buffer = 0.15  # Consider strikes within 15% of current price
-                        for strike in params.strikes:
-                            strike_pct_diff = abs(strike - self.current_price) / self.current_price
-                            if strike_pct_diff <= price_buffer:
-                                filtered_strikes.append(strike)
-                        
-                        # Create all option contracts at once for this expiration
-                        call_contracts = []
-                        put_contracts = []
+                        put_contract = Option(
+                            symbol=self.symbol,
+                            lastTradeDateOrContractMonth=expiry,
+                            strike=strike,
+                            right='P',
+                            exchange=exchange
+                        )
                         
-                        for strike in filtered_strikes:
-                            call_contract = Option(
-                                symbol=self.symbol,
-                                lastTradeDateOrContractMonth=expiry,
-                                strike=strike,
-                                right='C',
-                                exchange=exchange
-                            )
-                            
-                            put_contract = Option(
-                                symbol=self.symbol,
-                                lastTradeDateOrContractMonth=expiry,
-                                strike=strike,
-                                right='P',
-                                exchange=exchange
-                            )
+                        call_contracts.append(call_contract)
+                        put_contracts.append(put_contract)
+                    
+                    # Qualify all contracts at once
+                    qualified_calls = self.ib.qualifyContracts(*call_contracts)
+                    qualified_puts = self.ib.qualifyContracts(*put_contracts)
+                    
+                    # Request market data for all options at once
+                    call_tickers = {}
+                    put_tickers = {}
+                    
+                    for i, contract in enumerate(qualified_calls):
+                        if contract:
+                            ticker = self.ib.reqMktData(contract, genericTickList='101,104,106')  # Include greeks and implied vol
+                            call_tickers[filtered_strikes[i]] = (contract, ticker)
+                    
+                    for i, contract in enumerate(qualified_puts):
+                        if contract:
+                            ticker = self.ib.reqMktData(contract, genericTickList='101,104,106')
+                            put_tickers[filtered_strikes[i]] = (contract, ticker)
+                    
+                    # Give time for data to arrive
+                    self.ib.sleep(2)
+                    
+                    # Process all options
+                    for right, tickers, map_name in (('C', call_tickers, 'callExpDateMap'),
+                                                     ('P', put_tickers, 'putExpDateMap')):
+                        for strike, (contract, ticker) in tickers.items():
+                            # Skip if no useful data
+                            if not (ticker.bidSize or ticker.askSize or ticker.volume):
+                                continue
                             
-                            call_contracts.append(call_contract)
-                            put_contracts.append(put_contract)
-                        
-                        # Qualify all contracts at once
-                        qualified_calls = self.ib.qualifyContracts(*call_contracts)
-                        qualified_puts = self.ib.qualifyContracts(*put_contracts)
-                        
-                        # Request market data for all options at once
-                        call_tickers = {}
-                        put_tickers = {}
-                        
-                        for i, contract in enumerate(qualified_calls):
-                            if contract:
-                                ticker = self.ib.reqMktData(contract, genericTickList='101,104,106')  # Include greeks and implied vol
-                                call_tickers[filtered_strikes[i]] = (contract, ticker)
-                        
-                        for i, contract in enumerate(qualified_puts):
-                            if contract:
-                                ticker = self.ib.reqMktData(contract, genericTickList='101,104,106')
-                                put_tickers[filtered_strikes[i]] = (contract, ticker)
-                        
-                        # Give time for data to arrive
-                        self.ib.sleep(2)
-                        
-                        # Process all options
-                        for strike in filtered_strikes:
-                            # Process call option
-                            if strike in call_tickers:
-                                contract, call_ticker = call_tickers[strike]
-                                
-                                # Skip if no useful data
-                                if not (call_ticker.bidSize or call_ticker.askSize or call_ticker.volume):
-                                    continue
-                                    
-                                # Calculate mid price if bid/ask available
-                                mid_price = None
-                                if call_ticker.bid is not None and call_ticker.ask is not None:
-                                    mid_price = (call_ticker.bid + call_ticker.ask) / 2
-                                
-                                # Create call option data
-                                call_data = [{
-                                    'putCall': 'CALL',
-                                    'symbol': self.symbol,
-                                    'description': f"{self.symbol} {exp_date} {strike} Call",
-                                    'exchangeName': exchange,
-                                    'bid': call_ticker.bid if call_ticker.bid is not None else 0,
-                                    'ask': call_ticker.ask if call_ticker.ask is not None else 0,
-                                    'last': call_ticker.last if call_ticker.last is not None else 0,
-                                    'mark': mid_price if mid_price is not None else 0,
-                                    'bidSize': call_ticker.bidSize if call_ticker.bidSize is not None else 0,
-                                    'askSize': call_ticker.askSize if call_ticker.askSize is not None else 0,
-                                    'lastSize': call_ticker.lastSize if call_ticker.lastSize is not None else 0,
-                                    'highPrice': call_ticker.high if call_ticker.high is not None else 0,
-                                    'lowPrice': call_ticker.low if call_ticker.low is not None else 0,
-                                    'openPrice': call_ticker.open if call_ticker.open is not None else 0,
-                                    'closePrice': call_ticker.close if call_ticker.close is not None else 0,
-                                    'totalVolume': call_ticker.volume if call_ticker.volume is not None else 0,
-                                    'openInterest': 0,  # IB doesn't provide this directly in tickers
-                                    'volatility': call_ticker.impliedVol if call_ticker.impliedVol is not None else 0.2,
-                                    'delta': call_ticker.modelGreeks.delta if call_ticker.modelGreeks else 0,
-                                    'gamma': call_ticker.modelGreeks.gamma if call_ticker.modelGreeks else 0,
-                                    'theta': call_ticker.modelGreeks.theta if call_ticker.modelGreeks else 0,
-                                    'vega': call_ticker.modelGreeks.vega if call_ticker.modelGreeks else 0,
-                                    'rho': call_ticker.modelGreeks.rho if call_ticker.modelGreeks else 0,
-                                    'strikePrice': strike,
-                                    'expirationDate': exp_str,
-                                    'daysToExpiration': dte,
-                                    'multiplier': 100,
-                                    'inTheMoney': strike < self.current_price
-                                }]
-                                result['callExpDateMap'][exp_key][strike] = call_data
+                            result[map_name][exp_key][strike] = [self._build_option_record(
+                                ticker, strike, right, exp_date, exp_str, dte, exchange
+                            )]
                             
-                            # Process put option
-                            if strike in put_tickers:
-                                contract, put_ticker = put_tickers[strike]
-                                
-                                # Skip if no useful data
-                                if not (put_ticker.bidSize or put_ticker.askSize or put_ticker.volume):
-                                    continue
-                                
-                                # Calculate mid price if bid/ask available
-                                mid_price = None
-                                if put_ticker.bid is not None and put_ticker.ask is not None:
-                                    mid_price = (put_ticker.bid + put_ticker.ask) / 2
-                                
-                                # Create put option data
-                                put_data = [{
-                                    'putCall': 'PUT',
-                                    'symbol': self.symbol,
-                                    'description': f"{self.symbol} {exp_date} {strike} Put",
-                                    'exchangeName': exchange,
-                                    'bid': put_ticker.bid if put_ticker.bid is not None else 0,
-                                    'ask': put_ticker.ask if put_ticker.ask is not None else 0,
-                                    'last': put_ticker.last if put_ticker.last is not None else 0,
-                                    'mark': mid_price if mid_price is not None else 0,
-                                    'bidSize': put_ticker.bidSize if put_ticker.bidSize is not None else 0,
-                                    'askSize': put_ticker.askSize if put_ticker.askSize is not None else 0,
-                                    'lastSize': put_ticker.lastSize if put_ticker.lastSize is not None else 0,
-                                    'highPrice': put_ticker.high if put_ticker.high is not None else 0,
-                                    'lowPrice': put_ticker.low if put_ticker.low is not None else 0,
-                                    'openPrice': put_ticker.open if put_ticker.open is not None else 0,
-                                    'closePrice': put_ticker.close if put_ticker.close is not None else 0,
-                                    'totalVolume': put_ticker.volume if put_ticker.volume is not None else 0,
-                                    'openInterest': 0,  # IB doesn't provide this directly in tickers
-                                    'volatility': put_ticker.impliedVol if put_ticker.impliedVol is not None else 0.2,
-                                    'delta': put_ticker.modelGreeks.delta if put_ticker.modelGreeks else 0,
-                                    'gamma': put_ticker.modelGreeks.gamma if put_ticker.modelGreeks else 0,
-                                    'theta': put_ticker.modelGreeks.theta if put_ticker.modelGreeks else 0,
-                                    'vega': put_ticker.modelGreeks.vega if put_ticker.modelGreeks else 0,
-                                    'rho': put_ticker.modelGreeks.rho if put_ticker.modelGreeks else 0,
-                                    'strikePrice': strike,
-                                    'expirationDate': exp_str,
-                                    'daysToExpiration': dte,
-                                    'multiplier': 100,
-                                    'inTheMoney': strike > self.current_price
-                                }]
-                                result['putExpDateMap'][exp_key][strike] = put_data
-                                
-                        # Cancel market data for this batch to avoid overloading TWS/Gateway
-                        for _, (_, ticker) in call_tickers.items():
-                            self.ib.cancelMktData(ticker.contract)
-                        for _, (_, ticker) in put_tickers.items():
-                            self.ib.cancelMktData(ticker.contract)
-                
-                # If we got data, break out of the market data type loop
-                if result['callExpDateMap'] and result['putExpDateMap']:
-                    break
+                    # Cancel market data for this batch to avoid overloading TWS/Gateway
+                    for _, (_, ticker) in call_tickers.items():
+                        self.ib.cancelMktData(ticker.contract)
+                    for _, (_, ticker) in put_tickers.items():
+                        self.ib.cancelMktData(ticker.contract)
             
             # Cache the result
             self._option_chains_cache[cache_key] = result
@@ -360,9 +380,4 @@ class IBDataSource(DataSourceBase):
             
         except Exception as e:
             print(f"⚠️ IB API ERROR accessing data: {e}")
-            raise
-        finally:
-            # Disconnect from IB
-            if self.ib and self.ib.isConnected():
-                self.ib.disconnect()
-                print("Disconnected from Interactive Brokers") 
\ No newline at end of file
+            raise 
\ No newline at end of file
@@ -1,32 +1,172 @@
 """Schwab API data source for options chains"""
 
 import os
+import time
+import bisect
+import random
+import threading
 import datetime
+import itertools
 import json
-import pprint
 from dotenv import load_dotenv
 
 # Import Schwab client
 try:
     from schwab import auth as schwab_auth, client as schwab_client
 except ImportError:
+    schwab_auth = schwab_client = None
     print("schwab-py not installed. Run: pip install schwab-py")
+
+# orjson is optional - it serializes the debug chain dumps much faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
     
-from .base import DataSourceBase
+from .base import DataSourceBase, _json_loads
+from .cache import cached_chain
 
 # Load environment variables
 load_dotenv()
 
+# Retry policy for rate-limited (429) and server-error (5xx) responses
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 1.0  # seconds
+RETRY_MAX_DELAY = 30.0  # seconds
+RETRY_JITTER = 0.5  # +/- fraction of the delay
+
+# Client-side request shaping, kept under Schwab's 120 requests/minute limit
+RATE_LIMIT_PER_SEC = 2.0
+RATE_LIMIT_BURST = 20
+
+# Option fields shown in the debug summary, and the subset iron condor analysis needs
+ESSENTIAL_FIELDS = ('bid', 'ask', 'mark', 'delta', 'gamma', 'theta', 'vega',
+                    'totalVolume', 'openInterest', 'inTheMoney')
+REQUIRED_FIELDS = ('bid', 'ask', 'delta')
+
+# Authenticated clients keyed by (api_key, app_secret, callback_url, token_path)
+_CLIENT_POOL = {}
+
+
+def _strike_index(side_map):
+    """Return (sorted float strikes, {float strike: original key}) for one expiration's strike map"""
+    keys_by_strike = {float(key): key for key in side_map}
+    return sorted(keys_by_strike), keys_by_strike
+
+
+def _json_dumps(obj):
+    """Serialize an object to JSON bytes, using orjson when available"""
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode()
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Fail fast after repeated failures instead of waiting on a degraded endpoint
+    
+    closed: calls pass through; consecutive failures are counted
+    open: calls are rejected immediately until reset_timeout has elapsed
+    half-open: up to half_open_max trial calls decide whether to close or re-open
+    """
+    
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, half_open_max=1):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self.state = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+    
+    def _before_call(self):
+        with self._lock:
+            if self.state == 'open':
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    raise CircuitOpenError("Circuit breaker open - skipping call")
+                self.state = 'half-open'
+                self._half_open_calls = 0
+            if self.state == 'half-open':
+                if self._half_open_calls >= self.half_open_max:
+                    raise CircuitOpenError("Circuit breaker half-open - trial call already in flight")
+                self._half_open_calls += 1
+    
+    def _record(self, success):
+        with self._lock:
+            if success:
+                self.state = 'closed'
+                self._failures = 0
+                return
+            self._failures += 1
+            if self.state == 'half-open' or self._failures >= self.failure_threshold:
+                self.state = 'open'
+                self._opened_at = time.monotonic()
+    
+    def call(self, fn, *args, **kwargs):
+        """Call fn through the breaker
+        
+        Exceptions and 429/5xx responses count as failures; anything else is a success.
+        """
+        self._before_call()
+        try:
+            response = fn(*args, **kwargs)
+        except Exception:
+            self._record(False)
+            raise
+        status_code = getattr(response, 'status_code', 200)
+        self._record(status_code != 429 and not 500 <= status_code < 600)
+        return response
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to pace outgoing requests
+    
+    Tokens refill continuously at `rate` per second up to `capacity`; acquire()
+    blocks until enough tokens are available.
+    """
+    
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens=1):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+    
+    def drain(self):
+        """Drop all tokens, e.g. after the server reports a rate limit"""
+        with self._lock:
+            self._tokens = 0.0
+            self._updated_at = time.monotonic()
+
 
 class SchwabDataSource(DataSourceBase):
     """Schwab API data source for options chains"""
     
+    # Shared by all instances so an outage is detected once per process
+    _breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30.0, half_open_max=1)
+    _limiter = TokenBucket(rate=RATE_LIMIT_PER_SEC, capacity=RATE_LIMIT_BURST)
+    
     def __init__(self, symbol, min_dte, max_dte, min_liquidity):
         super().__init__(symbol, min_dte, max_dte, min_liquidity)
         self.api_key = os.getenv('SCHWAB_API_KEY')
         self.app_secret = os.getenv('SCHWAB_APP_SECRET')
         self.callback_url = os.getenv('SCHWAB_CALLBACK_URL', 'https://127.0.0.1:8182/')
         self.token_path = os.getenv('SCHWAB_TOKEN_PATH', 'schwab_token.json')
+        self.debug = os.getenv('ICC_DEBUG') == '1'  # Print chain summaries and dump sample data
         self.client = self._init_client()
     
     def _init_client(self):
@@ -34,6 +174,16 @@ class SchwabDataSource(DataSourceBase):
         if not self.api_key or not self.app_secret:
             print("Warning: Schwab API key or app secret not found. Will attempt to use other data sources.")
             return None
+        
+        if schwab_auth is None:
+            print("Warning: schwab-py not available. Will attempt to use other data sources.")
+            return None
+            
+        # Reuse the client from an earlier instance - easy_client reads and may refresh the token
+        pool_key = (self.api_key, self.app_secret, self.callback_url, self.token_path)
+        client = _CLIENT_POOL.get(pool_key)
+        if client:
+            return client
             
         try:
             client = schwab_auth.easy_client(
@@ -43,11 +193,42 @@ class SchwabDataSource(DataSourceBase):
                 self.token_path
             )
             print("Schwab client initialized successfully")
+            _CLIENT_POOL[pool_key] = client
             return client
         except Exception as e:
             print(f"Error initializing Schwab client: {e}")
             return None
     
+    def _call_with_retry(self, fn, *args, **kwargs):
+        """Call a Schwab client method, retrying rate limits and server errors
+        
+        Every attempt first takes a token from the shared rate limiter. Waits honor
+        the Retry-After header when present and otherwise back off exponentially,
+        with jitter. Other 4xx responses are returned immediately.
+        """
+        for attempt in range(MAX_RETRIES):
+            self._limiter.acquire()
+            response = fn(*args, **kwargs)
+            status_code = getattr(response, 'status_code', 200)
+            
+            if status_code != 429 and not 500 <= status_code < 600:
+                return response
+            if status_code == 429:
+                self._limiter.drain()  # Our burst allowance was wrong - start over from empty
+            if attempt == MAX_RETRIES - 1:
+                break
+            
+            try:
+                delay = float(response.headers.get('Retry-After', RETRY_BASE_DELAY * 2 ** attempt))
+            except (TypeError, ValueError, AttributeError):
+                delay = RETRY_BASE_DELAY * 2 ** attempt
+            delay = min(delay, RETRY_MAX_DELAY) * (1 + random.uniform(-RETRY_JITTER, RETRY_JITTER))
+            
+            print(f"⚠️ SCHWAB API returned {status_code} (attempt {attempt+1}/{MAX_RETRIES}), retrying in {delay:.1f}s...")
+            time.sleep(delay)
+        
+        return response
+    
     def get_current_price(self):
         """Get current price from Schwab API"""
         if not self.client:
@@ -57,7 +238,9 @@ class SchwabDataSource(DataSourceBase):
         try:
             # Get quotes for the symbol
             try:
-                quote_response = self.client.get_quotes(symbols=[self.symbol])
+                quote_response = self._breaker.call(
+                    self._call_with_retry, self.client.get_quotes, symbols=[self.symbol]
+                )
                 
                 # Check for HTTP errors
                 if hasattr(quote_response, 'status_code'):
@@ -68,7 +251,7 @@ class SchwabDataSource(DataSourceBase):
                         print(f"⚠️ SCHWAB API ERROR ({quote_response.status_code}): Failed to get quote for {self.symbol}")
                         return super().get_current_price()
                 
-                quote_data = quote_response.json()
+                quote_data = _json_loads(quote_response.content)
                 
                 # Check for API errors in response
                 if 'errors' in quote_data:
@@ -100,45 +283,45 @@ class SchwabDataSource(DataSourceBase):
         
         # Check call options
         if 'callExpDateMap' in options_data and options_data['callExpDateMap']:
-            call_expirations = list(options_data['callExpDateMap'].keys())
-            print(f"- Call options: {len(call_expirations)} expiration dates")
+            exp_map = options_data['callExpDateMap']
+            print(f"- Call options: {len(exp_map)} expiration dates")
             
-            # Show details for the first expiration
-            if call_expirations:
-                first_exp = call_expirations[0]
-                strikes = list(options_data['callExpDateMap'][first_exp].keys())
-                print(f"  Sample expiration {first_exp}:")
-                print(f"  - {len(strikes)} strikes available: " + 
-                      f"{', '.join(strikes[:5])}..." if len(strikes) > 5 else ', '.join(strikes))
-                
-                # Show details for a sample option
-                if strikes:
-                    first_strike = strikes[0]
-                    option = options_data['callExpDateMap'][first_exp][first_strike][0]
-                    print(f"  - Sample option at strike {first_strike}:")
-                    self._print_option_details(option)
+            # Show details for the first expiration - only the first few keys are touched
+            first_exp = next(iter(exp_map))
+            strike_map = exp_map[first_exp]
+            strikes = list(itertools.islice(strike_map, 5))
+            print(f"  Sample expiration {first_exp}:")
+            print(f"  - {len(strike_map)} strikes available: " + 
+                  f"{', '.join(strikes)}..." if len(strike_map) > 5 else ', '.join(strikes))
+            
+            # Show details for a sample option
+            if strikes:
+                first_strike = strikes[0]
+                option = strike_map[first_strike][0]
+                print(f"  - Sample option at strike {first_strike}:")
+                self._print_option_details(option)
         else:
             print("- No call options data found")
             
         # Check put options
         if 'putExpDateMap' in options_data and options_data['putExpDateMap']:
-            put_expirations = list(options_data['putExpDateMap'].keys())
-            print(f"- Put options: {len(put_expirations)} expiration dates")
+            exp_map = options_data['putExpDateMap']
+            print(f"- Put options: {len(exp_map)} expiration dates")
             
-            # Show details for the first expiration
-            if put_expirations:
-                first_exp = put_expirations[0]
-                strikes = list(options_data['putExpDateMap'][first_exp].keys())
-                print(f"  Sample expiration {first_exp}:")
-                print(f"  - {len(strikes)} strikes available: " + 
-                      f"{', '.join(strikes[:5])}..." if len(strikes) > 5 else ', '.join(strikes))
-                
-                # Show details for a sample option
-                if strikes:
-                    first_strike = strikes[0]
-                    option = options_data['putExpDateMap'][first_exp][first_strike][0]
-                    print(f"  - Sample option at strike {first_strike}:")
-                    self._print_option_details(option)
+            # Show details for the first expiration - only the first few keys are touched
+            first_exp = next(iter(exp_map))
+            strike_map = exp_map[first_exp]
+            strikes = list(itertools.islice(strike_map, 5))
+            print(f"  Sample expiration {first_exp}:")
+            print(f"  - {len(strike_map)} strikes available: " + 
+                  f"{', '.join(strikes)}..." if len(strike_map) > 5 else ', '.join(strikes))
+            
+            # Show details for a sample option
+            if strikes:
+                first_strike = strikes[0]
+                option = strike_map[first_strike][0]
+                print(f"  - Sample option at strike {first_strike}:")
+                self._print_option_details(option)
         else:
             print("- No put options data found")
             
@@ -149,23 +332,14 @@ class SchwabDataSource(DataSourceBase):
     
     def _print_option_details(self, option):
         """Print important details of an option contract"""
-        # Check what fields are available
-        fields = option.keys()
+        # Build all lines first and write them with a single print
+        lines = [f"    {field}: {option.get(field, '[Not available]')}" for field in ESSENTIAL_FIELDS]
         
-        # Print essential fields if they exist
-        essential_fields = ['bid', 'ask', 'mark', 'delta', 'gamma', 'theta', 'vega', 
-                            'totalVolume', 'openInterest', 'inTheMoney']
-        
-        for field in essential_fields:
-            if field in option:
-                print(f"    {field}: {option[field]}")
-            else:
-                print(f"    {field}: [Not available]")
-                
         # Check if any required fields for iron condor analysis are missing
-        missing_fields = [f for f in ['bid', 'ask', 'delta'] if f not in fields]
+        missing_fields = [f for f in REQUIRED_FIELDS if f not in option]
         if missing_fields:
-            print(f"    ⚠️ Missing required fields: {', '.join(missing_fields)}")
+            lines.append(f"    ⚠️ Missing required fields: {', '.join(missing_fields)}")
+        print('\n'.join(lines))
     
     def _check_iron_condor_candidates(self, options_data):
         """Check if there are potential iron condor candidates in the data"""
@@ -198,20 +372,20 @@ class SchwabDataSource(DataSourceBase):
             sample_exp = list(common_expirations)[0]
             print(f"Checking expiration: {sample_exp}")
             
-            # Get all strikes
-            call_strikes = sorted([float(strike) for strike in options_data['callExpDateMap'][sample_exp].keys()])
-            put_strikes = sorted([float(strike) for strike in options_data['putExpDateMap'][sample_exp].keys()])
+            # Get all strikes, sorted, along with the original key for each
+            call_strikes, call_keys = _strike_index(options_data['callExpDateMap'][sample_exp])
+            put_strikes, put_keys = _strike_index(options_data['putExpDateMap'][sample_exp])
             
             if not call_strikes or not put_strikes:
                 print("⚠️ No strike prices available for this expiration")
                 return
                 
-            print(f"Call strikes range: {min(call_strikes)} to {max(call_strikes)}")
-            print(f"Put strikes range: {min(put_strikes)} to {max(put_strikes)}")
+            print(f"Call strikes range: {call_strikes[0]} to {call_strikes[-1]}")
+            print(f"Put strikes range: {put_strikes[0]} to {put_strikes[-1]}")
             
             # Check for potential iron condor strikes (above and below current price)
-            otm_calls = [strike for strike in call_strikes if strike > current_price]
-            otm_puts = [strike for strike in put_strikes if strike < current_price]
+            otm_calls = call_strikes[bisect.bisect_right(call_strikes, current_price):]
+            otm_puts = put_strikes[:bisect.bisect_left(put_strikes, current_price)]
             
             if not otm_calls or not otm_puts:
                 print("⚠️ No suitable OTM options found for iron condor")
@@ -223,19 +397,19 @@ class SchwabDataSource(DataSourceBase):
             if len(otm_calls) >= 2 and len(otm_puts) >= 2:
                 # Sample short call
                 short_call_strike = otm_calls[0]  # Closest to the money
-                short_call = options_data['callExpDateMap'][sample_exp][str(short_call_strike)][0]
+                short_call = options_data['callExpDateMap'][sample_exp][call_keys[short_call_strike]][0]
                 
                 # Sample long call
                 long_call_strike = otm_calls[min(1, len(otm_calls)-1)]  # Second closest or same if only one
-                long_call = options_data['callExpDateMap'][sample_exp][str(long_call_strike)][0]
+                long_call = options_data['callExpDateMap'][sample_exp][call_keys[long_call_strike]][0]
                 
                 # Sample short put
                 short_put_strike = otm_puts[-1]  # Closest to the money
-                short_put = options_data['putExpDateMap'][sample_exp][str(short_put_strike)][0]
+                short_put = options_data['putExpDateMap'][sample_exp][put_keys[short_put_strike]][0]
                 
                 # Sample long put
                 long_put_strike = otm_puts[-min(2, len(otm_puts))]  # Second closest or same if only one
-                long_put = options_data['putExpDateMap'][sample_exp][str(long_put_strike)][0]
+                long_put = options_data['putExpDateMap'][sample_exp][put_keys[long_put_strike]][0]
                 
                 print(f"\nPossible iron condor structure:")
                 print(f"Long Put @ {long_put_strike} - Short Put @ {short_put_strike} - " +
@@ -273,17 +447,18 @@ class SchwabDataSource(DataSourceBase):
         
         # Save sample options to file for debugging
         try:
-            with open('debug_options_data.json', 'w') as f:
-                json.dump({
+            with open('debug_options_data.json', 'wb') as f:
+                f.write(_json_dumps({
                     'sample_expiration': sample_exp,
                     'current_price': current_price,
                     'call_sample': options_data['callExpDateMap'][sample_exp],
                     'put_sample': options_data['putExpDateMap'][sample_exp]
-                }, f, indent=2)
+                }))
             print("\nSaved sample options data to debug_options_data.json for further analysis")
         except Exception as e:
             print(f"Could not save debug data: {e}")
     
+    @cached_chain
     def get_option_chain(self):
         """Get options chain from Schwab API"""
         if not self.client:
@@ -295,15 +470,13 @@ class SchwabDataSource(DataSourceBase):
         from_date = today + datetime.timedelta(days=self.min_dte)
         to_date = today + datetime.timedelta(days=self.max_dte)
         
-        # Make sure we have current price
-        if not self.current_price:
-            self.current_price = self.get_current_price()
-        
         try:
             # Fetch options chain from Schwab
             try:
                 print(f"Fetching options chain from Schwab for {self.symbol} (from {from_date} to {to_date})")
-                options_response = self.client.get_option_chain(
+                options_response = self._breaker.call(
+                    self._call_with_retry,
+                    self.client.get_option_chain,
                     symbol=self.symbol,
                     contract_type=schwab_client.Client.Options.ContractType.ALL,  # ALL, CALL, PUT
                     from_date=from_date,
@@ -322,7 +495,7 @@ class SchwabDataSource(DataSourceBase):
                         print(f"⚠️ SCHWAB API ERROR ({options_response.status_code}): Failed to get options chain")
                         raise Exception(f"Failed to get options chain: HTTP {options_response.status_code}")
                 
-                options_data = options_response.json()
+                options_data = _json_loads(options_response.content)
                 
                 # Check for API errors in response
                 if 'errors' in options_data:
@@ -332,28 +505,35 @@ class SchwabDataSource(DataSourceBase):
                 print(f"⚠️ SCHWAB API ERROR while fetching options chain: {str(e)}")
                 raise Exception(f"Error fetching options chain: {str(e)}")
             
-            # Transform the response to match our expected format if needed
-            result = {
-                'callExpDateMap': {},
-                'putExpDateMap': {},
-                'underlying': self.current_price
-            }
+            # The chain already carries the underlying quote (include_underlying_quote=True),
+            # so a separate quotes round-trip is only needed if it is missing
+            underlying = options_data.get('underlying') or {}
+            self.current_price = (options_data.get('underlyingPrice') or underlying.get('last')
+                                  or self.current_price or self.get_current_price())
             
-            # Process calls and puts
-            if 'callExpDateMap' in options_data:
-                result['callExpDateMap'] = options_data['callExpDateMap']
-                print(f"✓ Successfully fetched call options for {len(options_data['callExpDateMap'])} expiration dates")
+            # Hand the parsed maps through by reference - no copying or placeholder dicts
+            call_map = options_data.get('callExpDateMap')
+            put_map = options_data.get('putExpDateMap')
+            
+            if call_map is not None:
+                print(f"✓ Successfully fetched call options for {len(call_map)} expiration dates")
             else:
                 print("⚠️ No call options data found in response")
                 
-            if 'putExpDateMap' in options_data:
-                result['putExpDateMap'] = options_data['putExpDateMap']
-                print(f"✓ Successfully fetched put options for {len(options_data['putExpDateMap'])} expiration dates")
+            if put_map is not None:
+                print(f"✓ Successfully fetched put options for {len(put_map)} expiration dates")
             else:
                 print("⚠️ No put options data found in response")
             
+            result = {
+                'callExpDateMap': call_map if call_map is not None else {},
+                'putExpDateMap': put_map if put_map is not None else {},
+                'underlying': self.current_price
+            }
+            
             # Debug the option chain structure
-            self._print_option_summary(result)
+            if self.debug:
+                self._print_option_summary(result)
                 
             return result
         except Exception as e:
@@ -2,9 +2,76 @@
 
 import datetime
 import math
-import requests
+import time
+import functools
+import numpy as np
+from scipy.special import ndtr
+from itertools import groupby, repeat
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
 
+from ..analysis import RISK_FREE_RATE
 from .base import DataSourceBase
+from .cache import cached_chain
+
+# Maximum number of expirations fetched from Yahoo in parallel
+MAX_FETCH_WORKERS = 10
+
+# Greek columns yfinance may or may not include in a chain
+GREEK_COLUMNS = ('delta', 'gamma', 'theta', 'vega')
+
+# Used for Greek estimates when the chain doesn't include them
+DEFAULT_VOLATILITY = 0.2
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+
+def estimate_greeks(strikes, ivs, price, dte, is_call, rate=RISK_FREE_RATE):
+    """Black-Scholes Greeks for a whole expiration at once
+    
+    ivs must be positive decimals (0.2 for 20%). is_call may be a single bool or a
+    boolean array, so calls and puts can be estimated together. Returns a dict of
+    arrays in Schwab units: theta per day, vega per 1% of volatility.
+    """
+    # Scalars shared by every strike are computed once, outside the array expressions
+    t = max(dte, 1) / 365.0
+    sqrt_t = math.sqrt(t)
+    discount_factor = math.exp(-rate * t)
+    
+    vol_sqrt_t = ivs * sqrt_t
+    d1 = (np.log(price / strikes) + (rate + 0.5 * ivs * ivs) * t) / vol_sqrt_t
+    d2 = d1 - vol_sqrt_t
+    # ndtr and the closed-form pdf skip scipy.stats' generic distribution machinery
+    pdf_d1 = np.exp(-0.5 * d1 * d1) * _INV_SQRT_2PI
+    
+    # Put Greeks differ from call Greeks only by N(x) -> N(x) - 1 in delta and the carry term
+    put_offset = np.logical_not(is_call).astype(float)
+    
+    return {
+        'delta': ndtr(d1) - put_offset,
+        'gamma': pdf_d1 / (price * vol_sqrt_t),
+        'theta': (-price * pdf_d1 * ivs / (2 * sqrt_t)
+                  - rate * strikes * discount_factor * (ndtr(d2) - put_offset)) / 365.0,
+        'vega': price * pdf_d1 * sqrt_t / 100.0
+    }
+
+
+@functools.cache
+def _yf():
+    """Import yfinance on first use; it pulls in a large dependency tree"""
+    import yfinance as yf
+    return yf
+
+
+@functools.lru_cache(maxsize=32)
+def _ticker_with_expirations(symbol, minute_bucket):
+    """A yfinance Ticker whose expiration list is already loaded, reused within the same minute
+    
+    minute_bucket only serves as part of the cache key, so entries expire when the minute
+    rolls over. The Ticker keeps the list, so option_chain() doesn't request it again.
+    """
+    stock = _yf().Ticker(symbol)
+    stock.options  # Fetches and stores the expiration dates
+    return stock
 
 
 class YahooDataSource(DataSourceBase):
@@ -13,111 +80,156 @@ class YahooDataSource(DataSourceBase):
     def __init__(self, symbol, min_dte, max_dte, min_liquidity):
         super().__init__(symbol, min_dte, max_dte, min_liquidity)
     
-    def get_option_chain(self):
-        """Get options data from Yahoo Finance API"""
+    @staticmethod
+    def _implied_vols(df):
+        """Implied volatilities for a chain side, with missing or zero values replaced by the default"""
+        if 'impliedVolatility' not in df.columns:
+            return np.full(len(df), DEFAULT_VOLATILITY)
+        ivs = df['impliedVolatility'].to_numpy(dtype=float)
+        return np.where(np.isfinite(ivs) & (ivs > 0), ivs, DEFAULT_VOLATILITY)
+    
+    def _estimate_expiration_greeks(self, calls_df, puts_df, dte):
+        """Estimate Greeks for both sides of an expiration in a single vectorized pass
+        
+        Returns:
+            tuple: (call estimates, put estimates), or (None, None) without a current price
+        """
+        if not self.current_price:
+            return None, None
+        
+        n_calls = len(calls_df)
+        strikes = np.concatenate([calls_df['strike'].to_numpy(dtype=float), puts_df['strike'].to_numpy(dtype=float)])
+        ivs = np.concatenate([self._implied_vols(calls_df), self._implied_vols(puts_df)])
+        is_call = np.arange(len(strikes)) < n_calls
+        
+        estimates = estimate_greeks(strikes, ivs, self.current_price, dte, is_call)
+        return ({col: values[:n_calls] for col, values in estimates.items()},
+                {col: values[n_calls:] for col, values in estimates.items()})
+    
+    def _chain_to_map(self, df, put_call, expiration, estimates=None):
+        """Convert one strike-sorted side of a yfinance chain into a {strike: [option]} map
+        
+        estimates supplies Greeks for any columns the chain doesn't include.
+        """
+        is_call = put_call == 'CALL'
+        right = 'C' if is_call else 'P'
+        
+        columns = set(df.columns)
+        strikes = df['strike'].to_numpy(dtype=float)
+        bid = df['bid'].to_numpy(dtype=float)
+        ask = df['ask'].to_numpy(dtype=float)
+        last = df['lastPrice'].to_numpy(dtype=float)
+        ivs = self._implied_vols(df)
+        
+        if 'inTheMoney' in columns:
+            in_the_money = df['inTheMoney'].to_numpy()
+        elif is_call:
+            in_the_money = self.current_price > strikes
+        else:
+            in_the_money = self.current_price < strikes
+        
+        strike_keys = [str(strike) for strike in strikes]
+        
+        # yfinance chains usually lack Greeks - fall back to the estimates for missing ones
+        greeks = {
+            col: df[col].to_numpy() if col in columns else (estimates[col] if estimates else None)
+            for col in GREEK_COLUMNS
+        }
+        
+        # Build all columns at once, then zip them into records without a DataFrame round-trip
+        fields = {
+            'putCall': put_call,
+            'symbol': [f"{self.symbol}_{expiration}_{right}_{key}" for key in strike_keys],
+            'description': [f"{self.symbol} {expiration} {put_call} {key}" for key in strike_keys],
+            'bid': bid,
+            'ask': ask,
+            'last': last,
+            'mark': np.where((bid > 0) & (ask > 0), (bid + ask) * 0.5, last),
+            **greeks,
+            'volatility': ivs,  # Decimal, like the IB and CBOE sources
+            'openInterest': df['openInterest'].to_numpy(),
+            'totalVolume': df['volume'].to_numpy(),
+            'inTheMoney': in_the_money
+        }
+        names = tuple(fields)
+        values = [
+            value.tolist() if isinstance(value, np.ndarray)
+            else value if isinstance(value, list)
+            else repeat(value)  # Scalars (putCall, missing greeks) are shared by every row
+            for value in fields.values()
+        ]
+        records = [dict(zip(names, row)) for row in zip(*values)]
+        
+        return {
+            key: [record for _, record in group]
+            for key, group in groupby(zip(strike_keys, records), key=itemgetter(0))
+        }
+    
+    def _fetch_expiration(self, stock, expiration, dte):
+        """Fetch and convert the option chain for a single expiration
+        
+        Returns:
+            tuple: (calls, puts) partial expiration maps for this expiration
+        """
+        # Format in the TDA API style for compatibility
+        option_key = f"{expiration}:{dte}"
+        
         try:
-            import yfinance as yf
+            chain = stock.option_chain(expiration)
+            
+            if not hasattr(chain, 'calls') or not hasattr(chain, 'puts'):
+                return {}, {}
             
-            stock = yf.Ticker(self.symbol)
-            expirations = stock.options
+            # Rows for the same strike must be adjacent so they can be grouped in one pass
+            calls_df, puts_df = (
+                df if df['strike'].is_monotonic_increasing else df.sort_values('strike', kind='stable')
+                for df in (chain.calls, chain.puts)
+            )
+            call_estimates, put_estimates = self._estimate_expiration_greeks(calls_df, puts_df, dte)
             
-            if not expirations:
-                print(f"No options expirations found for {self.symbol}")
-                return None
+            calls = self._chain_to_map(calls_df, 'CALL', expiration, call_estimates)
+            puts = self._chain_to_map(puts_df, 'PUT', expiration, put_estimates)
+        except Exception as e:
+            print(f"Error processing expiration {expiration}: {e}")
+            return {}, {}
+        
+        return ({option_key: calls} if calls else {}), ({option_key: puts} if puts else {})
+    
+    @cached_chain
+    def get_option_chain(self):
+        """Get options data from Yahoo Finance API"""
+        try:
+            # One pool for every request: the price lookup overlaps the expiration listing,
+            # then all in-range chains are fetched together
+            with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+                price_future = None if self.current_price else executor.submit(self.get_current_price)
+                stock = _ticker_with_expirations(self.symbol, int(time.time() // 60))
+                expirations = stock.options
                 
-            # Get current price if not set
-            if not self.current_price:
-                self.current_price = self.get_current_price()
+                if not expirations:
+                    print(f"No options expirations found for {self.symbol}")
+                    return None
                 
-            # Process all expiration dates that fall within our DTE criteria
-            calls_data = {}
-            puts_data = {}
-            
-            for expiration in expirations:
-                # Convert to datetime to calculate DTE
-                exp_date = datetime.datetime.strptime(expiration, "%Y-%m-%d").date()
-                today = datetime.datetime.now().date()
-                dte = (exp_date - today).days
+                # Keep only expiration dates that fall within our DTE criteria
+                today = datetime.date.today()
+                in_range = []
+                for expiration in expirations:
+                    dte = (datetime.date.fromisoformat(expiration) - today).days
+                    if (self.min_dte is None or dte >= self.min_dte) and \
+                       (self.max_dte is None or dte <= self.max_dte):
+                        in_range.append((expiration, dte))
+                
+                # The price is needed before conversion (moneyness and Greek estimates)
+                if price_future:
+                    self.current_price = price_future.result()
                 
-                # Check if this expiration is within our min/max DTE range
-                if (self.min_dte is not None and dte < self.min_dte) or \
-                   (self.max_dte is not None and dte > self.max_dte):
-                    continue
+                results = executor.map(lambda item: self._fetch_expiration(stock, *item), in_range)
                 
-                # Fetch option chain for this expiration
-                try:
-                    chain = stock.option_chain(expiration)
-                    
-                    if not hasattr(chain, 'calls') or not hasattr(chain, 'puts'):
-                        continue
-                        
-                    # Process calls
-                    for i, option in chain.calls.iterrows():
-                        strike = option.strike
-                        
-                        # Format in the TDA API style for compatibility
-                        option_key = f"{expiration}:{dte}"
-                        
-                        if option_key not in calls_data:
-                            calls_data[option_key] = {}
-                        
-                        if str(strike) not in calls_data[option_key]:
-                            calls_data[option_key][str(strike)] = []
-                        
-                        option_data = {
-                            'putCall': 'CALL',
-                            'symbol': f"{self.symbol}_{expiration}_C_{strike}",
-                            'description': f"{self.symbol} {expiration} CALL {strike}",
-                            'bid': option.bid,
-                            'ask': option.ask,
-                            'last': option.lastPrice,
-                            'mark': (option.bid + option.ask) / 2 if option.bid and option.ask else option.lastPrice,
-                            'delta': option.delta if hasattr(option, 'delta') else None,
-                            'gamma': option.gamma if hasattr(option, 'gamma') else None,
-                            'theta': option.theta if hasattr(option, 'theta') else None,
-                            'vega': option.vega if hasattr(option, 'vega') else None,
-                            'openInterest': option.openInterest,
-                            'totalVolume': option.volume,
-                            'inTheMoney': option.inTheMoney if hasattr(option, 'inTheMoney') else (self.current_price > strike)
-                        }
-                        
-                        calls_data[option_key][str(strike)].append(option_data)
-                    
-                    # Process puts
-                    for i, option in chain.puts.iterrows():
-                        strike = option.strike
-                        
-                        # Format in the TDA API style for compatibility
-                        option_key = f"{expiration}:{dte}"
-                        
-                        if option_key not in puts_data:
-                            puts_data[option_key] = {}
-                        
-                        if str(strike) not in puts_data[option_key]:
-                            puts_data[option_key][str(strike)] = []
-                        
-                        option_data = {
-                            'putCall': 'PUT',
-                            'symbol': f"{self.symbol}_{expiration}_P_{strike}",
-                            'description': f"{self.symbol} {expiration} PUT {strike}",
-                            'bid': option.bid,
-                            'ask': option.ask,
-                            'last': option.lastPrice,
-                            'mark': (option.bid + option.ask) / 2 if option.bid and option.ask else option.lastPrice,
-                            'delta': option.delta if hasattr(option, 'delta') else None,
-                            'gamma': option.gamma if hasattr(option, 'gamma') else None,
-                            'theta': option.theta if hasattr(option, 'theta') else None,
-                            'vega': option.vega if hasattr(option, 'vega') else None,
-                            'openInterest': option.openInterest,
-                            'totalVolume': option.volume,
-                            'inTheMoney': option.inTheMoney if hasattr(option, 'inTheMoney') else (self.current_price < strike)
-                        }
-                        
-                        puts_data[option_key][str(strike)].append(option_data)
-                        
-                except Exception as e:
-                    print(f"Error processing expiration {expiration}: {e}")
-                    continue
+                calls_data = {}
+                puts_data = {}
+                for calls, puts in results:
+                    calls_data.update(calls)
+                    puts_data.update(puts)
             
             return {
                 'callExpDateMap': calls_data,
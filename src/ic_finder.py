@@ -1,7 +1,5 @@
-import pandas as pd
 import datetime
 import os
-from dotenv import load_dotenv
 
 # Import modules
 from src.data_sources import create_data_source
@@ -9,8 +7,8 @@ from src.analysis import OptionsAnalysis
 from src.visualization import ChartGenerator
 from src.utilities import Utils
 
-# Load environment variables
-load_dotenv()
+# Position delta limit used when nothing meets the configured max_delta
+RELAXED_MAX_DELTA = 0.05
 
 class IronCondorFinder:
     """
@@ -53,6 +51,21 @@ class IronCondorFinder:
         )
         self.analysis = OptionsAnalysis()
         self.chart_generator = ChartGenerator('charts') if generate_charts else None
+        self._yahoo_fallback = None
+    
+    @property
+    def yahoo_client(self):
+        """Yahoo Finance data source used as a fallback, created once on first use"""
+        if self.data_source_client is not None and self.data_source == 'yahoo':
+            return self.data_source_client
+        if self._yahoo_fallback is None:
+            self._yahoo_fallback = create_data_source(
+                'yahoo', self.symbol, self.min_dte, self.max_dte, self.min_liquidity
+            )
+            # Carry over a price the primary source already fetched
+            if self.data_source_client is not None:
+                self._yahoo_fallback.current_price = self.data_source_client.current_price
+        return self._yahoo_fallback
     
     def get_current_price(self):
         """Get current price of the underlying asset"""
@@ -72,10 +85,8 @@ class IronCondorFinder:
         except Exception as e:
             print(f"Error getting options data: {e}")
             print("Attempting to use Yahoo Finance data as fallback...")
+            self.data_source_client = self.yahoo_client
             self.data_source = 'yahoo'
-            self.data_source_client = create_data_source(
-                'yahoo', self.symbol, self.min_dte, self.max_dte, self.min_liquidity
-            )
             options_data = self.data_source_client.get_option_chain()
         
         print(f"Current {self.symbol} price: ${current_price:.2f}")
@@ -92,8 +103,9 @@ class IronCondorFinder:
         print(f"Targeting price range between ${lower_bound:.2f} and ${upper_bound:.2f} (±{self.max_move_pct}%)")
         print(f"Using {self.spread_width}-point spreads between short and long legs")
         
-        # Find iron condors using analysis module
-        iron_condors = self.analysis.find_iron_condors(
+        # Find iron condors using analysis module - one scan yields both the standard and the
+        # relaxed delta results, so the fallback below doesn't have to run the analysis again
+        iron_condors, relaxed_condors = self.analysis.find_iron_condor_sets(
             options_data=options_data,
             current_price=current_price,
             lower_bound=lower_bound,
@@ -102,23 +114,14 @@ class IronCondorFinder:
             max_dte=self.max_dte,
             min_liquidity=self.min_liquidity,
             max_delta=self.max_delta,
+            relaxed_max_delta=RELAXED_MAX_DELTA,
             spread_width=self.spread_width
         )
         
-        # If no iron condors were found, try again with relaxed delta constraint
+        # If no iron condors were found, fall back to the relaxed delta constraint
         if not iron_condors:
-            print("\nNo iron condors found with standard criteria. Trying with relaxed delta constraint...")
-            iron_condors = self.analysis.find_iron_condors(
-                options_data=options_data,
-                current_price=current_price,
-                lower_bound=lower_bound,
-                upper_bound=upper_bound,
-                min_dte=self.min_dte,
-                max_dte=self.max_dte,
-                min_liquidity=self.min_liquidity,
-                max_delta=0.05,  # Relaxed delta constraint
-                spread_width=self.spread_width  # Use the same spread width
-            )
+            print(f"\nNo iron condors found with standard criteria. Using relaxed delta constraint ({RELAXED_MAX_DELTA})...")
+            iron_condors = relaxed_condors
         
         # Generate charts if requested
         if self.generate_charts and iron_condors and self.chart_generator:
@@ -136,11 +139,13 @@ class IronCondorFinder:
             print(f"\nTop {min(self.num_results, len(iron_condors))} Iron Condor Opportunities:")
             print("-" * 50)
             
-            for i, ic in enumerate(iron_condors[:self.num_results]):
-                # Calculate expected profit for each iron condor 
-                if 'expected_profit' not in ic:
-                    ic['expected_profit'] = Utils.calculate_expected_profit(ic)
-                    
+            # Calculate expected profit for any iron condors that don't have it yet, all at once
+            top_condors = iron_condors[:self.num_results]
+            missing = [ic for ic in top_condors if 'expected_profit' not in ic]
+            for ic, expected_profit in zip(missing, Utils.calculate_expected_profits(missing)):
+                ic['expected_profit'] = expected_profit
+            
+            for i, ic in enumerate(top_condors):
                 print(Utils.format_iron_condor_output(ic, i))
                 print()
                 
@@ -157,6 +162,10 @@ class IronCondorFinder:
 
 
 def main():
+    # Load environment variables (the data source modules also do this when imported)
+    from dotenv import load_dotenv
+    load_dotenv()
+    
     # Create an iron condor finder
     finder = IronCondorFinder(
         symbol='$SPX',
@@ -181,10 +190,8 @@ def main():
         print("Attempting to use Yahoo Finance data instead...")
         
         # Use the Yahoo Finance data instead
+        finder.data_source_client = finder.yahoo_client
         finder.data_source = 'yahoo'
-        finder.data_source_client = create_data_source(
-            'yahoo', finder.symbol, finder.min_dte, finder.max_dte, finder.min_liquidity
-        )
         try:
             iron_condors = finder.find_iron_condors()
             if iron_condors:
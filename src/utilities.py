@@ -1,4 +1,8 @@
-import pandas as pd
+import csv
+import functools
+import heapq
+from operator import itemgetter
+import numpy as np
 import datetime
 import os
 
@@ -17,8 +21,12 @@ class Utils:
             filename = f"ic_opportunities_{symbol}_{timestamp}.csv"
             
         try:
-            df = pd.DataFrame(iron_condors)
-            df.to_csv(filename, index=False)
+            # Union of keys in first-seen order; condors missing a column get an empty cell
+            fieldnames = list(dict.fromkeys(key for ic in iron_condors for key in ic))
+            with open(filename, 'w', newline='', buffering=1 << 20) as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(iron_condors)
             print(f"Exported {len(iron_condors)} iron condors to {filename}")
             return filename
         except Exception as e:
@@ -28,13 +36,8 @@ class Utils:
     @staticmethod
     def format_iron_condor_output(ic, index, include_chart=True):
         """Format iron condor for console output"""
-        output = []
-        output.append(f"#{index+1} - Expiration: {ic['expiration']} (DTE: {ic['dte']})")
-        
-        # Format the structure showing the short strikes clearly
-        output.append(f"Structure: {ic['long_put_strike']} / [{ic['short_put_strike']}] / [{ic['short_call_strike']}] / {ic['long_call_strike']}")
-        
-        # Add percent distance from current price
+        # Optional lines are rendered as '' or 'text\n' so the template below stays a single f-string
+        distance_line = ''
         if 'put_distance_pct' in ic and 'call_distance_pct' in ic:
             target = 2.0  # Our 2% target
             put_distance = ic['put_distance_pct']
@@ -44,8 +47,8 @@ class Utils:
             put_indicator = "✓" if abs(put_distance - target) < 0.3 else "⚠️"
             call_indicator = "✓" if abs(call_distance - target) < 0.3 else "⚠️"
             
-            output.append(f"Target: 2% range | Actual: Short Put {put_indicator} {put_distance:.2f}% below, " +
-                          f"Short Call {call_indicator} {call_distance:.2f}% above")
+            distance_line = (f"Target: 2% range | Actual: Short Put {put_indicator} {put_distance:.2f}% below, "
+                             f"Short Call {call_indicator} {call_distance:.2f}% above\n")
         elif 'current_price' in ic or ('risk_reward' in ic and ic['net_credit'] > 0):
             # Calculate based on available data
             if 'current_price' in ic:
@@ -57,61 +60,72 @@ class Utils:
             if current_price > 0:
                 put_pct = ((current_price - ic['short_put_strike']) / current_price) * 100
                 call_pct = ((ic['short_call_strike'] - current_price) / current_price) * 100
-                output.append(f"Distance: Short Put {put_pct:.2f}% below | Short Call {call_pct:.2f}% above")
+                distance_line = f"Distance: Short Put {put_pct:.2f}% below | Short Call {call_pct:.2f}% above\n"
         
-        # Financial information
-        output.append(f"Net Credit: ${ic['net_credit']:.2f} | Max Loss: ${ic['max_loss']:.2f}")
-        
-        # Add max profit and collateral
+        # Max profit and collateral
         max_profit = ic['net_credit'] * 100
-        max_width = max(ic['put_width'], ic['call_width'])
-        collateral = max_width * 100 - max_profit
-        output.append(f"Max Profit: ${max_profit:.2f} | Collateral: ${collateral:.2f}")
+        collateral = max(ic['put_width'], ic['call_width']) * 100 - max_profit
         
-        # Profitability metrics
+        # Profitability indicator
         if ic['probability_of_profit'] >= 60:
             prob_indicator = "✓"
         elif ic['probability_of_profit'] >= 40:
             prob_indicator = "⚠️"
         else:
             prob_indicator = "❌"
-            
-        output.append(f"Expected Profit: ${ic['expected_profit']:.2f} | Prob of Profit: {prob_indicator} {ic['probability_of_profit']:.1f}%")
-        
-        # Greeks - briefly formatted
-        output.append(f"Greeks - Delta: {ic['position_delta']:.4f} | Gamma: {ic['position_gamma']:.4f} | Theta: ${ic['position_theta']:.2f}")
-        
-        # Risk metrics
-        output.append(f"Risk/Reward: {ic['risk_reward']:.2f} | Put Width: {ic['put_width']} | Call Width: {ic['call_width']}")
         
         # Format volatility appropriately
         volatility = ic['implied_volatility']
         if volatility > 1:  # If still stored as percentage rather than decimal
             volatility = volatility / 100.0
-        output.append(f"Implied Volatility: {volatility*100:.1f}%")
         
-        if 'strategy_score' in ic:
-            output.append(f"Strategy Score: {ic['strategy_score']:.2f} (higher is better)")
+        score_line = (f"\nStrategy Score: {ic['strategy_score']:.2f} (higher is better)"
+                      if 'strategy_score' in ic else '')
+        chart_line = (f"\nP/L chart saved: {ic['chart_file']}"
+                      if include_chart and 'chart_file' in ic else '')
         
-        if include_chart and 'chart_file' in ic:
-            output.append(f"P/L chart saved: {ic['chart_file']}")
-            
-        return '\n'.join(output)
+        return (
+            f"#{index+1} - Expiration: {ic['expiration']} (DTE: {ic['dte']})\n"
+            f"Structure: {ic['long_put_strike']} / [{ic['short_put_strike']}] / [{ic['short_call_strike']}] / {ic['long_call_strike']}\n"
+            f"{distance_line}"
+            f"Net Credit: ${ic['net_credit']:.2f} | Max Loss: ${ic['max_loss']:.2f}\n"
+            f"Max Profit: ${max_profit:.2f} | Collateral: ${collateral:.2f}\n"
+            f"Expected Profit: ${ic['expected_profit']:.2f} | Prob of Profit: {prob_indicator} {ic['probability_of_profit']:.1f}%\n"
+            f"Greeks - Delta: {ic['position_delta']:.4f} | Gamma: {ic['position_gamma']:.4f} | Theta: ${ic['position_theta']:.2f}\n"
+            f"Risk/Reward: {ic['risk_reward']:.2f} | Put Width: {ic['put_width']} | Call Width: {ic['call_width']}\n"
+            f"Implied Volatility: {volatility*100:.1f}%"
+            f"{score_line}{chart_line}"
+        )
     
     @staticmethod
-    def sort_iron_condors(iron_condors, sort_method="risk_reward"):
-        """Sort iron condors by specified method"""
+    def sort_iron_condors(iron_condors, sort_method="risk_reward", top_k=None):
+        """Sort iron condors by specified method
+        
+        With top_k, only the best top_k are returned, selected with a heap instead of a full sort.
+        """
         if not iron_condors:
             return []
             
         if sort_method == "expected_profit":
-            return sorted(iron_condors, key=lambda x: x['expected_profit'], reverse=True)
+            key, largest = itemgetter('expected_profit'), True
         elif sort_method == "probability":
-            return sorted(iron_condors, key=lambda x: x['probability_of_profit'], reverse=True)
+            key, largest = itemgetter('probability_of_profit'), True
+        elif sort_method == "delta":  # Most delta-neutral first
+            key, largest = (lambda ic: abs(ic['position_delta'])), False
+        elif sort_method == "credit":
+            key, largest = itemgetter('net_credit'), True
+        elif sort_method == "score":
+            key, largest = itemgetter('strategy_score'), True
         else:  # Default to risk/reward (lowest first)
-            return sorted(iron_condors, key=lambda x: x['risk_reward'])
+            key, largest = itemgetter('risk_reward'), False
+        
+        if top_k is not None:
+            select = heapq.nlargest if largest else heapq.nsmallest
+            return select(top_k, iron_condors, key=key)
+        return sorted(iron_condors, key=key, reverse=largest)
     
     @staticmethod
+    @functools.lru_cache(maxsize=128)  # Bounded: keys include the live price, which changes every tick
     def get_strike_ranges(current_price, max_move_pct):
         """Calculate the lower and upper bounds for a given max move percentage"""
         lower_bound = current_price * (1 - max_move_pct/100)
@@ -122,10 +136,10 @@ class Utils:
     def validate_file_path(path):
         """Validate and create directory if needed for a file path"""
         directory = os.path.dirname(path)
-        if directory and not os.path.exists(directory):
+        if directory:
+            # One makedirs call covers both the existence check and the creation
             try:
-                os.makedirs(directory)
-                return True
+                os.makedirs(directory, exist_ok=True)
             except Exception as e:
                 print(f"Error creating directory {directory}: {e}")
                 return False
@@ -140,4 +154,18 @@ class Utils:
         
         # Expected value = (profit * probability of profit) + (loss * probability of loss)
         expected_profit = (net_credit * 100 * probability) - (max_loss * (1 - probability))
-        return expected_profit 
\ No newline at end of file
+        return expected_profit
+    
+    @staticmethod
+    def calculate_expected_profits(iron_condors):
+        """Calculate expected profit for a list of iron condors in one vectorized pass"""
+        if not iron_condors:
+            return []
+        count = len(iron_condors)
+        net_credit = np.fromiter((ic.get('net_credit', 0) for ic in iron_condors), dtype=float, count=count)
+        max_loss = np.fromiter((ic.get('max_loss', 0) for ic in iron_condors), dtype=float, count=count)
+        probability = np.fromiter((ic.get('probability_of_profit', 0) for ic in iron_condors),
+                                  dtype=float, count=count) / 100
+        
+        expected_profit = (net_credit * 100 * probability) - (max_loss * (1 - probability))
+        return expected_profit.tolist()
@@ -3,12 +3,12 @@ import pandas as pd
 import datetime
 import numpy as np
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def mock_spx_price():
     """Fixture for mock SPX price"""
     return 5300.0
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def mock_option_expiry_dates():
     """Fixture for mock option expiry dates"""
     today = datetime.datetime.now().date()
@@ -21,7 +21,7 @@ def mock_option_expiry_dates():
         today + datetime.timedelta(days=60),
     ]
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def mock_calls_data():
     """Fixture for mock calls data"""
     # Create a DataFrame with mock call options data
@@ -43,7 +43,7 @@ def mock_calls_data():
     }
     return pd.DataFrame(calls_data)
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def mock_puts_data():
     """Fixture for mock puts data"""
     # Create a DataFrame with mock put options data
@@ -65,31 +65,36 @@ def mock_puts_data():
     }
     return pd.DataFrame(puts_data)
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def mock_option_chain(mock_option_expiry_dates, mock_calls_data, mock_puts_data):
-    """Fixture for complete mock option chain"""
+    """Fixture for complete mock option chain
+
+    Session scoped along with the data it is built from: tests only read the chain,
+    so it is built once instead of once per test.
+    """
     # Create a dictionary with expiry dates as keys and option chains as values
+    today = datetime.datetime.now().date()
     option_chain = {}
     for expiry in mock_option_expiry_dates:
-        # Add some random variation to each expiry's data
-        calls = mock_calls_data.copy()
-        puts = mock_puts_data.copy()
-        
         # Adjust values slightly for each expiration
-        days_to_expiry = (expiry - datetime.datetime.now().date()).days
+        days_to_expiry = (expiry - today).days
         iv_adjustment = 1 + (days_to_expiry / 100)
         price_adjustment = 1 + (days_to_expiry / 200)
         
-        calls['impliedVolatility'] = calls['impliedVolatility'] * iv_adjustment
-        puts['impliedVolatility'] = puts['impliedVolatility'] * iv_adjustment
-        
-        calls['lastPrice'] = calls['lastPrice'] * price_adjustment
-        puts['lastPrice'] = puts['lastPrice'] * price_adjustment
-        calls['bid'] = calls['bid'] * price_adjustment
-        puts['bid'] = puts['bid'] * price_adjustment
-        calls['ask'] = calls['ask'] * price_adjustment
-        puts['ask'] = puts['ask'] * price_adjustment
+        # assign() builds each adjusted frame directly instead of copying and then overwriting columns
+        calls = mock_calls_data.assign(
+            impliedVolatility=mock_calls_data['impliedVolatility'] * iv_adjustment,
+            lastPrice=mock_calls_data['lastPrice'] * price_adjustment,
+            bid=mock_calls_data['bid'] * price_adjustment,
+            ask=mock_calls_data['ask'] * price_adjustment,
+        )
+        puts = mock_puts_data.assign(
+            impliedVolatility=mock_puts_data['impliedVolatility'] * iv_adjustment,
+            lastPrice=mock_puts_data['lastPrice'] * price_adjustment,
+            bid=mock_puts_data['bid'] * price_adjustment,
+            ask=mock_puts_data['ask'] * price_adjustment,
+        )
         
         option_chain[expiry] = {'calls': calls, 'puts': puts}
     
-    return option_chain 
\ No newline at end of file
+    return option_chain
@@ -1,3 +1,6 @@
+import datetime
+
+
 class MockDataSource:
     """Mock data source for testing"""
     
@@ -11,6 +14,10 @@ class MockDataSource:
         self.mock_price = mock_price
         self.mock_option_chain = mock_option_chain
         self.symbol = "SPX"
+        
+        # Days to expiration per expiry, computed once rather than on every query
+        today = datetime.datetime.now().date()
+        self._dte_map = {expiry: (expiry - today).days for expiry in mock_option_chain}
     
     def get_current_price(self):
         """Get current price of the underlying
@@ -31,19 +38,7 @@ class MockDataSource:
             dict: Dictionary of options data by expiration date
         """
         # Filter by DTE if specified
-        import datetime
-        today = datetime.datetime.now().date()
-        
-        filtered_chain = {}
-        for expiry, data in self.mock_option_chain.items():
-            dte = (expiry - today).days
-            
-            # Apply DTE filters if specified
-            if min_dte is not None and dte < min_dte:
-                continue
-            if max_dte is not None and dte > max_dte:
-                continue
-                
-            filtered_chain[expiry] = data
-        
-        return filtered_chain 
\ No newline at end of file
+        low = min_dte if min_dte is not None else float('-inf')
+        high = max_dte if max_dte is not None else float('inf')
+        return {expiry: data for expiry, data in self.mock_option_chain.items()
+                if low <= self._dte_map[expiry] <= high}
@@ -0,0 +1,56 @@
+import pytest
+import datetime
+from zoneinfo import ZoneInfo
+
+from src.data_sources import cache
+from src.data_sources.base import DataSourceBase
+
+
+class CountingDataSource(DataSourceBase):
+    """Data source that counts how often the underlying fetch runs"""
+
+    def __init__(self):
+        super().__init__('SPX', 1, 7, 10)
+        self.calls = 0
+
+    @cache.cached_chain
+    def get_option_chain(self):
+        self.calls += 1
+        return {'callExpDateMap': {}, 'putExpDateMap': {}, 'underlying': 5300.0}
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the chain cache at a temporary directory"""
+    monkeypatch.setattr(cache, 'CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+
+def test_cached_chain_reuses_result(cache_dir):
+    """A second call within the TTL is served from disk"""
+    ds = CountingDataSource()
+    first = ds.get_option_chain()
+    second = ds.get_option_chain()
+
+    assert ds.calls == 1
+    assert second == first
+    assert ds.current_price == 5300.0
+
+
+def test_cached_chain_force_refresh(cache_dir):
+    """force_refresh bypasses the cache"""
+    ds = CountingDataSource()
+    ds.get_option_chain()
+    ds.get_option_chain(force_refresh=True)
+
+    assert ds.calls == 2
+
+
+def test_chain_cache_ttl_depends_on_market_hours():
+    """Entries expire quickly while the market is open"""
+    tz = ZoneInfo('America/New_York')
+    open_time = datetime.datetime(2024, 6, 12, 11, 0, tzinfo=tz)  # Wednesday
+    weekend = datetime.datetime(2024, 6, 15, 11, 0, tzinfo=tz)  # Saturday
+
+    assert cache.chain_cache_ttl(open_time) == cache.INTRADAY_TTL
+    assert cache.chain_cache_ttl(weekend) == cache.CLOSED_TTL
@@ -0,0 +1,85 @@
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.data_sources import ib as ib_module
+from src.data_sources.ib import IBDataSource, close_ib_connections
+
+
+@pytest.fixture
+def empty_pool():
+    """Start and end each test with no pooled connections"""
+    ib_module._IB_POOL.clear()
+    yield ib_module._IB_POOL
+    ib_module._IB_POOL.clear()
+
+
+def test_init_client_retries_refused_connects(empty_pool):
+    """Refused connects back off and rotate client IDs, with no sleep after the last attempt"""
+    client = MagicMock()
+    client.connect.side_effect = ConnectionRefusedError("gateway down")
+    ds = IBDataSource('SPX', 1, 7, 10)
+
+    with patch.object(ib_module, 'IB', return_value=client, create=True), \
+            patch('src.data_sources.ib.time.sleep') as mock_sleep:
+        assert ds._init_client() is None
+
+    client_ids = [c.kwargs['clientId'] for c in client.connect.call_args_list]
+    assert client_ids == [ds.client_id + i for i in range(ib_module._CONNECT_ATTEMPTS)]
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [1, 2, 4, 8]
+    assert empty_pool == {}
+
+
+def test_init_client_fails_fast_on_other_errors(empty_pool):
+    """Errors other than refused or timed-out connects are not retried"""
+    client = MagicMock()
+    client.connect.side_effect = ValueError("bad host")
+    ds = IBDataSource('SPX', 1, 7, 10)
+
+    with patch.object(ib_module, 'IB', return_value=client, create=True), \
+            patch('src.data_sources.ib.time.sleep') as mock_sleep:
+        assert ds._init_client() is None
+
+    assert client.connect.call_count == 1
+    mock_sleep.assert_not_called()
+
+
+def test_pooled_connection_shared_until_closed(empty_pool):
+    """Instances reuse one pooled connection, which only close_ib_connections disconnects"""
+    client = MagicMock()
+    client.isConnected.return_value = True
+
+    with patch.object(ib_module, 'IB', return_value=client, create=True) as mock_ib:
+        first = IBDataSource('SPX', 1, 7, 10)._init_client()
+        second = IBDataSource('SPX', 1, 7, 10)._init_client()
+
+    assert first is second is client
+    assert mock_ib.call_count == 1
+    client.disconnect.assert_not_called()
+
+    close_ib_connections()
+    client.disconnect.assert_called_once()
+    assert empty_pool == {}
+
+
+def test_select_market_data_type_falls_back_on_nan_quote():
+    """A probe ticker whose fields are all nan (ib_async's unset value) switches to delayed data"""
+    nan = float('nan')
+    ds = IBDataSource('SPX', 1, 7, 10)
+    ds.ib = MagicMock()
+    ds.ib.reqMktData.return_value = MagicMock(bid=nan, last=nan, close=nan)
+
+    assert ds._select_market_data_type(MagicMock()) == 3
+    assert [c.args[0] for c in ds.ib.reqMarketDataType.call_args_list] == [1, 3]
+    assert ds.ib.sleep.call_count == 10
+
+
+def test_select_market_data_type_keeps_live_quote():
+    """A probe ticker with a real bid keeps live data without waiting"""
+    nan = float('nan')
+    ds = IBDataSource('SPX', 1, 7, 10)
+    ds.ib = MagicMock()
+    ds.ib.reqMktData.return_value = MagicMock(bid=5300.0, last=nan, close=nan)
+
+    assert ds._select_market_data_type(MagicMock()) == 1
+    ds.ib.reqMarketDataType.assert_called_once_with(1)
+    ds.ib.sleep.assert_not_called()
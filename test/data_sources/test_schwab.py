@@ -0,0 +1,53 @@
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.data_sources.schwab import CircuitBreaker, CircuitOpenError, TokenBucket
+
+
+def test_circuit_breaker_opens_after_failures():
+    """The breaker rejects calls once the failure threshold is reached"""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0)
+    failing = MagicMock(return_value=MagicMock(status_code=503))
+
+    breaker.call(failing)
+    breaker.call(failing)
+    assert breaker.state == 'open'
+
+    with pytest.raises(CircuitOpenError):
+        breaker.call(failing)
+    assert failing.call_count == 2
+
+
+def test_circuit_breaker_half_open_recovers():
+    """A successful trial call after the timeout closes the breaker again"""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+
+    with patch('src.data_sources.schwab.time.monotonic', return_value=100.0):
+        with pytest.raises(RuntimeError):
+            breaker.call(MagicMock(side_effect=RuntimeError("timeout")))
+    assert breaker.state == 'open'
+
+    with patch('src.data_sources.schwab.time.monotonic', return_value=131.0):
+        response = breaker.call(MagicMock(return_value=MagicMock(status_code=200)))
+    assert response.status_code == 200
+    assert breaker.state == 'closed'
+
+
+def test_token_bucket_waits_when_empty():
+    """acquire() sleeps for the refill time once the burst is used up"""
+    clock = [0.0]
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    with patch('src.data_sources.schwab.time.monotonic', side_effect=lambda: clock[0]), \
+            patch('src.data_sources.schwab.time.sleep', side_effect=fake_sleep):
+        bucket = TokenBucket(rate=2.0, capacity=2)
+        bucket.acquire()
+        bucket.acquire()
+        assert sleeps == []
+
+        bucket.acquire()
+    assert sleeps == [0.5]
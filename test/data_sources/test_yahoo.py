@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock
+
+from src.analysis import OptionsAnalysis
+from src.data_sources.yahoo import YahooDataSource, estimate_greeks
+
+
+def test_estimate_greeks_put_call_parity():
+    """Call and put deltas differ by one; gamma and vega match across sides"""
+    strikes = np.array([90.0, 100.0, 110.0])
+    ivs = np.array([0.25, 0.2, 0.18])
+
+    calls = estimate_greeks(strikes, ivs, 100.0, 30, is_call=True)
+    puts = estimate_greeks(strikes, ivs, 100.0, 30, is_call=False)
+
+    np.testing.assert_allclose(calls['delta'] - puts['delta'], 1.0)
+    np.testing.assert_allclose(calls['gamma'], puts['gamma'])
+    np.testing.assert_allclose(calls['vega'], puts['vega'])
+    assert np.all(np.diff(calls['delta']) < 0)
+    assert np.all(calls['theta'] < 0)
+
+
+def test_fetch_expiration_fills_missing_greeks():
+    """Chains without Greek columns get estimates instead of None"""
+    ds = YahooDataSource('SPY', 1, 45, 10)
+    ds.current_price = 100.0
+    calls = pd.DataFrame({
+        'strike': [105.0, 95.0],
+        'bid': [0.5, 6.0],
+        'ask': [0.7, 6.4],
+        'lastPrice': [0.6, 6.2],
+        'openInterest': [50, 100],
+        'volume': [5, 10],
+        'impliedVolatility': [0.2, 0.22]
+    })
+    puts = calls.assign(bid=[6.0, 1.0], ask=[6.4, 1.2], impliedVolatility=[0.0, 0.22])
+    stock = MagicMock()
+    stock.option_chain.return_value = MagicMock(calls=calls, puts=puts)
+
+    call_map, put_map = ds._fetch_expiration(stock, '2024-07-19', 30)
+
+    call_options = call_map['2024-07-19:30']
+    put_options = put_map['2024-07-19:30']
+    assert list(call_options) == ['95.0', '105.0']
+    for key in call_options:
+        call, put = call_options[key][0], put_options[key][0]
+        assert 0.0 < call['delta'] < 1.0
+        assert -1.0 < put['delta'] < 0.0
+        assert call['gamma'] > 0 and put['vega'] > 0
+    assert put_options['105.0'][0]['volatility'] == 0.2  # Zero IV falls back to the default
+
+
+def test_low_implied_volatility_stays_low():
+    """IVs under 10% are emitted as decimals, so the analysis floors them rather than reading 50%"""
+    ds = YahooDataSource('SPX', 1, 45, 10)
+    ds.current_price = 5300.0
+    chain = pd.DataFrame({
+        'strike': [5200.0, 5400.0],
+        'bid': [1.0, 1.0],
+        'ask': [1.2, 1.2],
+        'lastPrice': [1.1, 1.1],
+        'openInterest': [50, 50],
+        'volume': [5, 5],
+        'impliedVolatility': [0.08, 0.08]
+    })
+    stock = MagicMock()
+    stock.option_chain.return_value = MagicMock(calls=chain, puts=chain)
+
+    call_map, _ = ds._fetch_expiration(stock, '2024-07-19', 3)
+    vol = call_map['2024-07-19:3']['5400.0'][0]['volatility']
+    assert vol == 0.08
+
+    analysis = OptionsAnalysis()
+    prob = analysis.calculate_probability_of_profit(5300.0, 5200.0, 5400.0, 3, vol)
+    assert prob == analysis.calculate_probability_of_profit(5300.0, 5200.0, 5400.0, 3, 0.10)
+    assert prob > analysis.calculate_probability_of_profit(5300.0, 5200.0, 5400.0, 3, 0.50)
@@ -7,6 +7,7 @@ Simple unit test script that runs without pytest.
 import sys
 import os
 import datetime
+import functools
 import pandas as pd
 import numpy as np
 
@@ -15,8 +16,12 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from test.data_sources.mock_data_source import MockDataSource
 
+@functools.lru_cache(maxsize=1)
 def create_mock_data():
-    """Create mock data for testing"""
+    """Create mock data for testing
+
+    Built once and shared by every test here; the tests only read it.
+    """
     # Mock current price
     mock_price = 5300.0
     
@@ -62,10 +67,9 @@ def create_mock_data():
     }
     puts_df = pd.DataFrame(puts_data)
     
-    # Create option chain
-    option_chain = {}
-    for expiry in mock_expiry_dates:
-        option_chain[expiry] = {'calls': calls_df.copy(), 'puts': puts_df.copy()}
+    # Create option chain - every expiry shares the same read-only entry
+    entry = {'calls': calls_df, 'puts': puts_df}
+    option_chain = {expiry: entry for expiry in mock_expiry_dates}
     
     return mock_price, option_chain
 
@@ -99,9 +103,9 @@ def test_mock_data_source():
     today = datetime.datetime.now().date()
     min_dte = 2
     options_min = ds.get_options_chain(min_dte=min_dte)
-    for expiry in options_min.keys():
-        dte = (expiry - today).days
-        assert dte >= min_dte, f"DTE filter failed: {dte} < {min_dte}"
+    dtes = np.fromiter(((expiry - today).days for expiry in options_min), dtype=np.int32,
+                       count=len(options_min))
+    assert (dtes >= min_dte).all(), f"DTE filter failed: {dtes.min()} < {min_dte}"
     print("  ✓ get_options_chain (with DTE filter) test passed")
     
     print("All MockDataSource tests passed!")
@@ -117,6 +121,7 @@ def test_basic_iron_condor_finder():
     # Define a simple iron condor finder function
     def find_iron_condors(options_chain, current_price):
         results = []
+        today = datetime.datetime.now().date()
         
         # Calculate price range
         lower_bound = current_price * 0.98  # 2% down
@@ -126,39 +131,36 @@ def test_basic_iron_condor_finder():
             calls = data['calls']
             puts = data['puts']
             
-            # Find calls with strikes above the upper bound
-            valid_calls = calls[calls['strike'] >= upper_bound]
-            
-            # Find puts with strikes below the lower bound
-            valid_puts = puts[puts['strike'] <= lower_bound]
-            
-            if valid_calls.empty or valid_puts.empty:
-                continue
+            # Pull the needed columns out once as strike-sorted arrays and index them by position
+            call_order = np.argsort(calls['strike'].to_numpy(), kind='stable')
+            c_strike, c_bid, c_ask = (calls[col].to_numpy()[call_order] for col in ('strike', 'bid', 'ask'))
+            put_order = np.argsort(puts['strike'].to_numpy(), kind='stable')
+            p_strike, p_bid, p_ask = (puts[col].to_numpy()[put_order] for col in ('strike', 'bid', 'ask'))
             
             # Find proper iron condor with correct strike ordering
             # Start with short call (first strike above upper bound)
-            short_call_row = valid_calls.iloc[0]
-            short_call_strike = short_call_row['strike']
+            sc = np.searchsorted(c_strike, upper_bound, side='left')
+            if sc == len(c_strike):
+                continue
+            short_call_strike = c_strike[sc]
             
-            # Long call must be above short call strike
-            long_call_candidates = calls[calls['strike'] > short_call_strike]
-            if long_call_candidates.empty:
+            # Long call must be above short call strike: binary search for the next one up
+            lc = np.searchsorted(c_strike, short_call_strike, side='right')
+            if lc == len(c_strike):
                 continue  # Can't find a valid long call
-                
-            long_call_row = long_call_candidates.iloc[0]
-            long_call_strike = long_call_row['strike']
+            long_call_strike = c_strike[lc]
             
-            # Short put should be first strike below lower bound
-            short_put_row = valid_puts.iloc[-1]  # Last of the valid puts (highest strike below lower bound)
-            short_put_strike = short_put_row['strike']
+            # Short put should be first strike below lower bound (highest strike at or below it)
+            sp = np.searchsorted(p_strike, lower_bound, side='right') - 1
+            if sp < 0:
+                continue
+            short_put_strike = p_strike[sp]
             
-            # Long put must be below short put strike
-            long_put_candidates = puts[puts['strike'] < short_put_strike]
-            if long_put_candidates.empty:
+            # Long put must be below short put strike: the closest one sits just before it
+            lp = np.searchsorted(p_strike, short_put_strike, side='left') - 1
+            if lp < 0:
                 continue  # Can't find a valid long put
-                
-            long_put_row = long_put_candidates.iloc[-1]  # Last one will be closest to short put
-            long_put_strike = long_put_row['strike']
+            long_put_strike = p_strike[lp]
             
             # Verify the strike order (for debugging)
             if not (long_put_strike < short_put_strike < short_call_strike < long_call_strike):
@@ -166,13 +168,10 @@ def test_basic_iron_condor_finder():
                 continue
             
             # Calculate net credit
-            net_credit = (
-                short_call_row['bid'] - long_call_row['ask'] + 
-                short_put_row['bid'] - long_put_row['ask']
-            )
+            net_credit = c_bid[sc] - c_ask[lc] + p_bid[sp] - p_ask[lp]
             
             # Add to results
-            dte = (expiry - datetime.datetime.now().date()).days
+            dte = (expiry - today).days
             iron_condor = {
                 'expiry': expiry,
                 'dte': dte,
@@ -1,10 +1,13 @@
 import pytest
 from datetime import datetime
-import pandas as pd
-import math
+import numpy as np
 
 from test.data_sources.mock_data_source import MockDataSource
 
+# Per-condor fields produced from the vectorized arrays, in construction order
+RESULT_FIELDS = ('short_put_strike', 'long_put_strike', 'short_call_strike', 'long_call_strike',
+                 'net_credit', 'max_loss', 'position_delta', 'risk_reward')
+
 # Simple Iron Condor finding function for testing purposes
 def find_iron_condors(options_chain, current_price, max_move_pct=2.0, max_delta=0.01):
     """
@@ -19,7 +22,8 @@ def find_iron_condors(options_chain, current_price, max_move_pct=2.0, max_delta=
     Returns:
     list: List of iron condor opportunities
     """
-    results = []
+    batches = []  # (expiry, dte, result columns) for each expiry with matches
+    today = datetime.now().date()
     
     # Calculate price range
     lower_bound = current_price * (1 - max_move_pct/100)
@@ -30,86 +34,66 @@ def find_iron_condors(options_chain, current_price, max_move_pct=2.0, max_delta=
         calls = data['calls']
         puts = data['puts']
         
-        # Find calls with strikes above the upper bound
-        valid_calls = calls[calls['strike'] >= upper_bound]
+        # Pull the needed columns out once, sorted by strike
+        call_order = np.argsort(calls['strike'].to_numpy(), kind='stable')
+        call_strikes = calls['strike'].to_numpy(dtype=float)[call_order]
+        call_bid = calls['bid'].to_numpy(dtype=float)[call_order]
+        call_ask = calls['ask'].to_numpy(dtype=float)[call_order]
+        call_delta = calls['delta'].to_numpy(dtype=float)[call_order]
+        
+        put_order = np.argsort(puts['strike'].to_numpy(), kind='stable')
+        put_strikes = puts['strike'].to_numpy(dtype=float)[put_order]
+        put_bid = puts['bid'].to_numpy(dtype=float)[put_order]
+        put_ask = puts['ask'].to_numpy(dtype=float)[put_order]
+        put_delta = puts['delta'].to_numpy(dtype=float)[put_order]
+        
+        # Calls with strikes above the upper bound, puts with strikes below the lower bound
+        valid_c = np.nonzero(call_strikes >= upper_bound)[0]
+        valid_p = np.nonzero(put_strikes <= lower_bound)[0]
+        
+        # Each short call pairs with the next higher strike, each short put with the next lower one
+        sc, lc = valid_c[:-1], valid_c[1:]
+        sp, lp = valid_p[1:], valid_p[:-1]
+        if sc.size == 0 or sp.size == 0:
+            continue
+        
+        # Every call spread against every put spread, evaluated as whole arrays
+        SC, SP = np.meshgrid(sc, sp, indexing='ij')
+        LC, LP = np.meshgrid(lc, lp, indexing='ij')
         
-        # Find puts with strikes below the lower bound
-        valid_puts = puts[puts['strike'] <= lower_bound]
+        position_delta = call_delta[SC] + call_delta[LC] + put_delta[SP] + put_delta[LP]
+        net_credit = call_bid[SC] - call_ask[LC] + put_bid[SP] - put_ask[LP]
+        call_spread_width = call_strikes[LC] - call_strikes[SC]
+        put_spread_width = put_strikes[SP] - put_strikes[LP]
+        max_loss = np.minimum(call_spread_width, put_spread_width) - net_credit
         
-        if valid_calls.empty or valid_puts.empty:
+        # Delta neutral and profitable iron condors only
+        mask = (np.abs(position_delta) <= max_delta) & (net_credit > 0) & (max_loss > 0)
+        rows, cols = np.nonzero(mask)
+        if rows.size == 0:
             continue
         
-        # Try different combinations
-        for i, short_call_row in valid_calls.iterrows():
-            short_call_strike = short_call_row['strike']
-            
-            # Find the next higher strike for long call
-            long_call_candidates = valid_calls[valid_calls['strike'] > short_call_strike]
-            if long_call_candidates.empty:
-                continue
-                
-            long_call_row = long_call_candidates.iloc[0]
-            long_call_strike = long_call_row['strike']
-            
-            for j, short_put_row in valid_puts.iterrows():
-                short_put_strike = short_put_row['strike']
-                
-                # Find the next lower strike for long put
-                long_put_candidates = valid_puts[valid_puts['strike'] < short_put_strike]
-                if long_put_candidates.empty:
-                    continue
-                    
-                long_put_row = long_put_candidates.iloc[-1]
-                long_put_strike = long_put_row['strike']
-                
-                # Calculate position delta
-                position_delta = (
-                    short_call_row['delta'] + 
-                    long_call_row['delta'] + 
-                    short_put_row['delta'] + 
-                    long_put_row['delta']
-                )
-                
-                # Filter by delta neutrality
-                if abs(position_delta) > max_delta:
-                    continue
-                
-                # Calculate net credit
-                net_credit = (
-                    short_call_row['bid'] - long_call_row['ask'] + 
-                    short_put_row['bid'] - long_put_row['ask']
-                )
-                
-                # Calculate max loss
-                call_spread_width = long_call_strike - short_call_strike
-                put_spread_width = short_put_strike - long_put_strike
-                max_loss = min(call_spread_width, put_spread_width) - net_credit
-                
-                # Only include profitable iron condors
-                if net_credit <= 0 or max_loss <= 0:
-                    continue
-                
-                # Calculate basic metrics
-                risk_reward = max_loss / net_credit
-                
-                # Add to results
-                dte = (expiry - datetime.now().date()).days
-                iron_condor = {
-                    'expiry': expiry,
-                    'dte': dte,
-                    'short_put_strike': short_put_strike,
-                    'long_put_strike': long_put_strike,
-                    'short_call_strike': short_call_strike,
-                    'long_call_strike': long_call_strike,
-                    'net_credit': net_credit,
-                    'max_loss': max_loss,
-                    'position_delta': position_delta,
-                    'risk_reward': risk_reward,
-                }
-                results.append(iron_condor)
+        # Keep the matches as columns, in RESULT_FIELDS order
+        selected_credit = net_credit[rows, cols]
+        selected_loss = max_loss[rows, cols]
+        batches.append((expiry, (expiry - today).days, (
+            put_strikes[SP[rows, cols]], put_strikes[LP[rows, cols]],
+            call_strikes[SC[rows, cols]], call_strikes[LC[rows, cols]],
+            selected_credit, selected_loss, position_delta[rows, cols], selected_loss / selected_credit)))
+    
+    if not batches:
+        return []
     
-    # Sort by risk/reward ratio (better opportunities first)
-    results.sort(key=lambda x: x['risk_reward'])
+    # Sort by risk/reward ratio (better opportunities first) with one argsort across all expiries;
+    # the stable sort keeps ties in expiry/strike order
+    columns = [np.concatenate(column) for column in zip(*(batch[2] for batch in batches))]
+    batch_index = np.repeat(np.arange(len(batches)), [len(batch[2][0]) for batch in batches])
+    order = np.argsort(columns[-1], kind='stable')
+    
+    results = []
+    for k, values in zip(batch_index[order].tolist(), zip(*(column[order].tolist() for column in columns))):
+        expiry, dte = batches[k][:2]
+        results.append({'expiry': expiry, 'dte': dte, **dict(zip(RESULT_FIELDS, values))})
     return results
 
 def test_find_iron_condors(mock_spx_price, mock_option_chain):
@@ -6,16 +6,19 @@ from unittest.mock import patch, MagicMock
 from src.ic_finder import IronCondorFinder
 from test.data_sources.mock_data_source import MockDataSource
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def patched_data_source(mock_spx_price, mock_option_chain):
-    """Fixture that patches the create_data_source function to return our mock data source"""
+    """Fixture that patches the create_data_source function to return our mock data source
+
+    Module scoped: the patch is entered once for these tests and only affects src.ic_finder.
+    """
     mock_ds = MockDataSource(mock_spx_price, mock_option_chain)
     
     # Create a patcher for the create_data_source function
     with patch('src.ic_finder.create_data_source', return_value=mock_ds) as patcher:
         yield patcher
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def patched_chart_generator():
     """Fixture that patches the ChartGenerator to avoid actually creating charts"""
     with patch('src.ic_finder.ChartGenerator') as mock:
@@ -1,16 +1,15 @@
 import pytest
 import os
-import tempfile
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from unittest.mock import patch, MagicMock
 
-from src.visualization import ChartGenerator
+from src.visualization import ChartGenerator, MIN_PARALLEL_CHARTS, MIN_PROGRESS_CHARTS, _price_grid
 
-@pytest.fixture
-def chart_generator():
-    """Fixture for chart generator with a temporary output directory"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        yield ChartGenerator(output_dir=temp_dir)
+@pytest.fixture(scope='session')
+def chart_generator(tmp_path_factory):
+    """Fixture for one chart generator shared by the session, writing to a temporary directory"""
+    return ChartGenerator(output_dir=str(tmp_path_factory.mktemp('charts')))
 
 @pytest.fixture
 def mock_iron_condor_data():
@@ -23,6 +22,7 @@ def mock_iron_condor_data():
         'net_credit': 4.5,
         'max_loss': 45.5,
         'prob_profit': 0.65,
+        'probability_of_profit': 65.0,
         'expiration': '2023-06-18',
         'dte': 3,
         'position_delta': 0.005,
@@ -40,57 +40,110 @@ def test_init(chart_generator):
     assert chart_generator.output_dir is not None
     assert os.path.exists(chart_generator.output_dir)
 
-@patch('matplotlib.pyplot.savefig')
-@patch('matplotlib.pyplot.close')
-@patch('matplotlib.pyplot.fill_between')
-@patch('numpy.linspace', return_value=np.array([1, 2, 3]))
+@pytest.mark.parametrize('custom_filename', [None, "custom_test_chart.png"])
+@patch('matplotlib.figure.Figure.savefig')
+@patch('matplotlib.axes.Axes.fill_between')
+@patch('src.visualization._price_grid', return_value=np.array([1, 2, 3]))
 @patch('src.visualization.ChartGenerator.calculate_profits', return_value=np.array([10, -5, 15]))
-def test_generate_iron_condor_chart(mock_calc_profits, mock_linspace, mock_fill_between, 
-                                  mock_close, mock_savefig, chart_generator, mock_iron_condor_data):
-    """Test generation of iron condor chart with mocked numpy operations"""
+def test_generate_iron_condor_chart(mock_calc_profits, mock_price_grid, mock_fill_between, 
+                                  mock_savefig, custom_filename, chart_generator, mock_iron_condor_data):
+    """Test generation of iron condor chart, with the default and a custom filename"""
     current_price = 5300.0
     
     # Call the method
-    filename = chart_generator.generate_iron_condor_chart(mock_iron_condor_data, current_price)
+    filename = chart_generator.generate_iron_condor_chart(
+        mock_iron_condor_data, current_price, filename=custom_filename
+    )
     
-    # Check that the method returns a filename
-    assert filename is not None
+    # Check that the method returns the default or the custom filename
     assert isinstance(filename, str)
-    assert filename.endswith('.png')
+    if custom_filename is None:
+        assert filename.endswith('.webp')
+    else:
+        assert filename == os.path.join(chart_generator.output_dir, custom_filename)
     
     # Check that savefig was called
     mock_savefig.assert_called_once()
     
-    # Check that close was called to avoid memory leaks
-    mock_close.assert_called_once()
-    
     # Check that the numpy array operations were called
-    mock_linspace.assert_called_once()
+    mock_price_grid.assert_called_once()
     mock_calc_profits.assert_called_once()
 
-@patch('matplotlib.pyplot.savefig')
-@patch('matplotlib.pyplot.close')
-@patch('matplotlib.pyplot.fill_between')
-@patch('numpy.linspace', return_value=np.array([1, 2, 3]))
-@patch('src.visualization.ChartGenerator.calculate_profits', return_value=np.array([10, -5, 15]))
-def test_generate_iron_condor_chart_with_custom_filename(
-    mock_calc_profits, mock_linspace, mock_fill_between, mock_close, mock_savefig, 
-    chart_generator, mock_iron_condor_data
-):
-    """Test generation of iron condor chart with custom filename"""
-    current_price = 5300.0
-    custom_filename = "custom_test_chart.png"
+def test_reuses_figure_across_charts(chart_generator, mock_iron_condor_data):
+    """Consecutive charts are drawn on the same cached figure"""
+    with patch('matplotlib.figure.Figure.savefig'):
+        chart_generator.generate_iron_condor_chart(mock_iron_condor_data, 5300.0, filename='a.png')
+        fig, ax = chart_generator._figures[(10, 6)]
+        chart_generator.generate_iron_condor_chart(mock_iron_condor_data, 5300.0, filename='b.png')
     
-    # Call the method with custom filename
-    filename = chart_generator.generate_iron_condor_chart(
-        mock_iron_condor_data, current_price, filename=custom_filename
-    )
+    assert chart_generator._figures == {(10, 6): (fig, ax)}
+    assert len(ax.lines) == 3  # P/L curve, zero line, current price - none left from the first chart
+
+def test_calculate_profits(chart_generator):
+    """Test the iron condor payoff at expiration across the price grid"""
+    prices = np.array([5100.0, 5150.0, 5175.0, 5300.0, 5425.0, 5450.0, 5500.0])
     
-    # Check that the method returns the custom filename
-    assert filename == os.path.join(chart_generator.output_dir, custom_filename)
+    profits = chart_generator.calculate_profits(prices, 5150, 5200, 5400, 5450, 4.5)
     
-    # Check that savefig was called with the custom filename
-    mock_savefig.assert_called_once()
+    # Max loss beyond the wings, partial loss inside the spreads, full credit in the middle
+    np.testing.assert_allclose(profits, [-4550.0, -4550.0, -2050.0, 450.0, -2050.0, -4550.0, -4550.0])
+
+
+def test_price_grid_includes_breakpoints():
+    """Breakpoints inside the range are added to the grid, ones outside are dropped"""
+    prices = _price_grid(5000.0, 5600.0, [4900.0, 5150.0, 5200.0, 5400.0, 5450.0])
+    
+    assert prices[0] == 5000.0 and prices[-1] == 5600.0
+    assert np.all(np.diff(prices) > 0)
+    assert {5150.0, 5200.0, 5400.0, 5450.0} <= set(prices.tolist())
+    assert 4900.0 not in prices
+
+
+def test_generate_multiple_charts_in_process_pool(tmp_path, mock_iron_condor_data):
+    """A batch large enough for the process pool returns every chart path, in input order"""
+    generator = ChartGenerator(output_dir=str(tmp_path), dpi=50)
+    iron_condors = [
+        dict(mock_iron_condor_data,
+             short_put_strike=5200 - 25 * i, long_put_strike=5150 - 25 * i,
+             short_call_strike=5400 + 25 * i, long_call_strike=5450 + 25 * i)
+        for i in range(4)
+    ]
+    
+    # Force two workers even on single-core machines, and lower the batch threshold so a few
+    # charts take the pool path
+    with patch('src.visualization.os.cpu_count', return_value=2), \
+            patch('src.visualization.MIN_PARALLEL_CHARTS', 4), \
+            patch('src.visualization.ProcessPoolExecutor', wraps=ProcessPoolExecutor) as mock_pool:
+        filepaths = generator.generate_multiple_charts(iron_condors, 5300.0)
+    
+    mock_pool.assert_called_once_with(max_workers=2)
+    assert filepaths == [
+        os.path.join(str(tmp_path), f"ic_20230618_{ic['long_put_strike']}_{ic['short_put_strike']}_"
+                                    f"{ic['short_call_strike']}_{ic['long_call_strike']}.webp")
+        for ic in iron_condors
+    ]
+    assert all(os.path.getsize(path) > 0 for path in filepaths)
+
+def test_generate_multiple_charts_small_batch_stays_serial(chart_generator, mock_iron_condor_data):
+    """A typical top-results batch renders in process instead of starting workers"""
+    iron_condors = [mock_iron_condor_data] * (MIN_PARALLEL_CHARTS - 1)
+    
+    with patch('src.visualization.os.cpu_count', return_value=8), \
+            patch('src.visualization.ProcessPoolExecutor') as mock_pool, \
+            patch.object(ChartGenerator, 'generate_iron_condor_chart', return_value='chart.webp') as mock_chart:
+        filepaths = chart_generator.generate_multiple_charts(iron_condors, 5300.0)
+    
+    mock_pool.assert_not_called()
+    assert mock_chart.call_count == len(iron_condors)
+    assert filepaths == ['chart.webp'] * len(iron_condors)
+
+def test_collect_charts_throttles_progress(capsys):
+    """Large batches keep every path but print progress only every 1% and at the end"""
+    total = MIN_PROGRESS_CHARTS * 2
+    paths = [f"chart_{i}.webp" for i in range(total)]
+    
+    assert ChartGenerator._collect_charts(iter(paths), total) == paths
     
-    # Check that close was called to avoid memory leaks
-    mock_close.assert_called_once() 
\ No newline at end of file
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 100
+    assert lines[-1] == f"Generated {total}/{total} charts"
@@ -6,38 +6,178 @@ Minimal test for Yahoo price fetching.
 This file doesn't import from src/, so it can be run from anywhere.
 """
 
+import os
+import json
+import shelve
+import functools
+import threading
 import requests
 import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-def get_current_price(symbol):
-    """Get current price of the underlying asset with retry logic"""
-    max_retries = 3
-    retry_delay = 2  # seconds
+# orjson is optional - it decodes the chart payload faster than the stdlib parser
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MAX_RETRY_DELAY = 60  # seconds
+PRICE_CACHE_PATH = os.path.join('.cache', 'prices')
+PRICE_CACHE_TTL = 15 * 60  # seconds a price stays reusable across runs
+
+YAHOO_RATE_PER_SEC = 5.0  # Request pace kept below Yahoo's limit
+YAHOO_MAX_CONCURRENCY = 4  # Per-symbol fallback requests in flight at once
+
+class TokenBucket:
+    """Thread-safe token bucket: tokens refill at `rate` per second up to `capacity`"""
+    
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+# Shared by every Yahoo request in these scripts, so they pace themselves instead of hitting 429s
+yahoo_bucket = TokenBucket(rate=YAHOO_RATE_PER_SEC, capacity=5)
+
+_price_memo = {}  # (symbol, minute) -> price, for repeat lookups within a run
+_price_cache_lock = threading.Lock()  # shelve does not support concurrent access
+
+def _cache_lookup(symbol):
+    """Return a cached price for symbol - from this minute's memo or a fresh disk entry - or None"""
+    key = (symbol, int(time.time() // 60))
+    if key in _price_memo:
+        return _price_memo[key]
     
-    for attempt in range(max_retries):
+    with _price_cache_lock:
         try:
-            url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?interval=1d"
-            response = requests.get(url)
-            
-            if response.status_code == 429:
-                print(f"Rate limited (attempt {attempt+1}/{max_retries}), waiting {retry_delay} seconds...")
-                time.sleep(retry_delay)
-                retry_delay *= 2  # Exponential backoff
-                continue
-                
-            if response.status_code != 200:
-                print(f"Error fetching price data: {response.status_code}")
-                return None
-                
-            data = response.json()
-            price = data['chart']['result'][0]['meta']['regularMarketPrice']
-            return price
+            with shelve.open(PRICE_CACHE_PATH) as db:
+                entry = db.get(symbol)
+        except Exception:
+            entry = None  # Missing or unreadable cache - fetch fresh data
+    
+    if entry and time.time() - entry[1] < PRICE_CACHE_TTL:
+        _price_memo[key] = entry[0]
+        return entry[0]
+    return None
+
+def _cache_store(symbol, price):
+    """Remember a fetched price in the per-minute memo and on disk"""
+    with _price_cache_lock:
+        try:
+            os.makedirs(os.path.dirname(PRICE_CACHE_PATH), exist_ok=True)
+            with shelve.open(PRICE_CACHE_PATH) as db:
+                db[symbol] = (price, time.time())
         except Exception as e:
-            print(f"Error getting current price: {e}")
+            print(f"Could not write price cache: {e}")
+    _price_memo[(symbol, int(time.time() // 60))] = price
+
+def cached_price(fetch):
+    """Memoize a price fetcher per symbol and minute in process, and on disk for PRICE_CACHE_TTL
+    
+    Repeated dev runs then reuse recent prices instead of hitting Yahoo (and its 429s) again.
+    Failed fetches (None) are not cached.
+    """
+    @functools.wraps(fetch)
+    def wrapper(symbol, *args, **kwargs):
+        price = _cache_lookup(symbol)
+        if price is None:
+            price = fetch(symbol, *args, **kwargs)
+            if price is None:
+                return None
+            _cache_store(symbol, price)
+        return price
+    
+    return wrapper
+
+# One pooled session for every Yahoo request: connections are reused across symbols and
+# retries, and urllib3 backs off on 429/5xx, honoring Retry-After when Yahoo sends it
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=8, pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=1, backoff_max=MAX_RETRY_DELAY,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      respect_retry_after_header=True, raise_on_status=False)))
+
+@cached_price
+def get_current_price(symbol, session=None):
+    """Get current price of the underlying asset
+    
+    Retries happen in SESSION's adapter; pass another requests.Session to use it instead.
+    """
+    http = session or SESSION
+    try:
+        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?interval=1d&range=1d"
+        yahoo_bucket.acquire()
+        response = http.get(url, timeout=(3, 10))
+        
+        if response.status_code != 200:
+            print(f"Error fetching price data: {response.status_code}")
             return None
+            
+        data = _decode(response.content)
+        price = data['chart']['result'][0]['meta']['regularMarketPrice']
+        return price
+    except Exception as e:
+        print(f"Error getting current price: {e}")
+        return None
+
+def _decode(content):
+    """Parse a Yahoo JSON response body"""
+    return orjson.loads(content) if orjson else json.loads(content)
+
+def get_current_prices(symbols, session=None):
+    """Get current prices for several symbols, fetching every uncached one in a single request
     
-    print(f"Failed after {max_retries} attempts")
-    return None
+    Uses the multi-symbol v7 quote endpoint - one round trip and one rate-limit token for the
+    whole batch. Symbols the batch does not return (or all of them, if Yahoo refuses the
+    request) fall back to per-symbol chart lookups. Returns {symbol: price or None}.
+    """
+    http = session or SESSION
+    prices = {symbol: _cache_lookup(symbol) for symbol in symbols}
+    missing = [symbol for symbol, price in prices.items() if price is None]
+    
+    if missing:
+        try:
+            url = f"https://query1.finance.yahoo.com/v7/finance/quote?symbols={','.join(missing)}"
+            yahoo_bucket.acquire()
+            response = http.get(url, timeout=(3, 10))
+            
+            if response.status_code == 200:
+                for quote in _decode(response.content)['quoteResponse']['result']:
+                    price = quote.get('regularMarketPrice')
+                    if quote.get('symbol') in prices and price is not None:
+                        prices[quote['symbol']] = price
+                        _cache_store(quote['symbol'], price)
+            else:
+                print(f"Batch quote request failed ({response.status_code}), fetching symbols one by one")
+        except Exception as e:
+            print(f"Error getting batch quotes: {e}")
+        
+        # Fallback lookups overlap on a small pool; the token bucket still paces them
+        leftover = [symbol for symbol in missing if prices[symbol] is None]
+        if leftover:
+            with ThreadPoolExecutor(max_workers=min(YAHOO_MAX_CONCURRENCY, len(leftover))) as executor:
+                prices.update(zip(leftover, executor.map(
+                    functools.partial(get_current_price, session=session), leftover)))
+    
+    return prices
 
 def main():
     """Test Yahoo Finance price fetching"""
@@ -45,13 +185,10 @@ def main():
     
     symbols = ['SPX', 'SPY', 'AAPL', 'MSFT', 'GOOG']
     
-    for symbol in symbols:
-        # Add a sleep between symbols to avoid rate limiting
-        if symbol != symbols[0]:
-            print(f"Waiting 1 second before fetching {symbol}...")
-            time.sleep(1)
-            
-        price = get_current_price(symbol)
+    # One batched quote request covers every symbol
+    prices = get_current_prices(symbols)
+    
+    for symbol, price in prices.items():
         if price:
             print(f"{symbol} price: ${price:.2f}")
         else: